@@ -12,6 +12,7 @@ from app.models import (
     ShopAccountEntry,
     ShopAccountTitle,
     User,
+    UserToken,
 )  # noqa: F401 - Import models for metadata
 from app.models.types import IntEnumType
 
@@ -0,0 +1,35 @@
+"""user_tokens digest
+
+Revision ID: 4f2d8c6a1e90
+Revises: 9b3e5f1c2a7d
+Create Date: 2026-10-17 11:02:47.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2d8c6a1e90'
+down_revision: Union[str, None] = '9b3e5f1c2a7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('user_tokens', sa.Column('token_digest', sa.BINARY(length=32), nullable=True))
+    # Rows written before this revision keep the raw token until they expire
+    op.alter_column('user_tokens', 'token',
+               existing_type=sa.String(length=2048),
+               nullable=True)
+
+
+def downgrade() -> None:
+    # Digest-only rows cannot be converted back; those users log in again
+    op.execute("DELETE FROM user_tokens WHERE token IS NULL")
+    op.alter_column('user_tokens', 'token',
+               existing_type=sa.String(length=2048),
+               nullable=False)
+    op.drop_column('user_tokens', 'token_digest')
@@ -0,0 +1,45 @@
+"""partition shop_account_entries
+
+Revision ID: 9c3f5a1e7b24
+Revises: 4b8c1e7a2d90
+Create Date: 2026-10-17 16:21:45.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3f5a1e7b24'
+down_revision: Union[str, None] = '4b8c1e7a2d90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# p2020 also holds every older year; later years are added by the
+# manage_partitions command, which splits them off p_future
+PARTITION_YEARS = range(2020, 2028)
+
+
+def upgrade() -> None:
+    # Partitioned InnoDB tables support no foreign keys, and the primary key
+    # must include the partitioning column
+    op.drop_constraint('shop_account_entries_ibfk_1', 'shop_account_entries', type_='foreignkey')
+    op.drop_constraint('shop_account_entries_ibfk_2', 'shop_account_entries', type_='foreignkey')
+    op.execute('ALTER TABLE shop_account_entries DROP PRIMARY KEY, ADD PRIMARY KEY (id, year)')
+    partitions = [
+        f'PARTITION p{year} VALUES LESS THAN ({year + 1})' for year in PARTITION_YEARS
+    ]
+    partitions.append('PARTITION p_future VALUES LESS THAN MAXVALUE')
+    op.execute(
+        'ALTER TABLE shop_account_entries PARTITION BY RANGE (year) '
+        f'({", ".join(partitions)})'
+    )
+
+
+def downgrade() -> None:
+    # Fails if entries of deleted shops or titles were left behind
+    op.execute('ALTER TABLE shop_account_entries REMOVE PARTITIONING')
+    op.execute('ALTER TABLE shop_account_entries DROP PRIMARY KEY, ADD PRIMARY KEY (id)')
+    op.create_foreign_key('shop_account_entries_ibfk_1', 'shop_account_entries', 'shop_account_titles', ['shop_account_title_id'], ['id'])
+    op.create_foreign_key('shop_account_entries_ibfk_2', 'shop_account_entries', 'shops', ['shop_id'], ['id'])
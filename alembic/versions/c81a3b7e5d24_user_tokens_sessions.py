@@ -0,0 +1,33 @@
+"""user_tokens sessions
+
+Revision ID: c81a3b7e5d24
+Revises: 4f2d8c6a1e90
+Create Date: 2026-10-17 12:20:09.553871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81a3b7e5d24'
+down_revision: Union[str, None] = '4f2d8c6a1e90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows become the session of tokens issued without a sid claim
+    op.add_column('user_tokens', sa.Column('session_id', sa.String(length=64), server_default='', nullable=False))
+    op.drop_constraint('PRIMARY', 'user_tokens', type_='primary')
+    op.create_primary_key('pk_user_tokens', 'user_tokens', ['user_id', 'session_id'])
+
+
+def downgrade() -> None:
+    # Keep only pre-session rows so user_id is unique again
+    op.execute("DELETE FROM user_tokens WHERE session_id <> ''")
+    op.drop_constraint('PRIMARY', 'user_tokens', type_='primary')
+    op.create_primary_key('pk_user_tokens', 'user_tokens', ['user_id'])
+    op.drop_column('user_tokens', 'session_id')
@@ -1,48 +1,129 @@
 """Authentication module with JWT token handling."""
 
+import asyncio
+import secrets
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
-from app.database import get_db
-from app.dynamodb import is_token_valid
+from app.database import get_async_db
+from app.hashing import HashingBusyError, PasswordHashExecutor, get_hash_concurrency
 from app.models import User
-from app.schemas import TokenData
+from app.repository import USER_BY_EMAIL
+from app.schemas import Principal, TokenData
+from app.token_cache import token_cache
+from app.token_store import is_token_valid
 
 settings = get_settings()
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Hashes made with other parameters report needs_update and are rehashed on login
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=settings.argon2_time_cost,
+    argon2__memory_cost=settings.argon2_memory_cost,
+    argon2__parallelism=settings.argon2_parallelism,
+)
+
+# Hash verified on the unknown-email path so it costs the same as a real login.
+# Computed once at startup with the live parameters; its password is random so
+# nothing can ever match it.
+DUMMY_PASSWORD_HASH = pwd_context.hash(secrets.token_urlsafe(32))
+
+# Dedicated executor bounding how many hashes hold their memory at once
+hash_executor = PasswordHashExecutor(
+    max_workers=(
+        settings.password_hash_max_concurrency
+        or get_hash_concurrency(
+            pwd_context.handler().memory_cost,
+            settings.password_hash_memory_reserve_mb * 1024 * 1024,
+        )
+    ),
+    max_queue=settings.password_hash_max_queue,
+    queue_timeout=settings.password_hash_queue_timeout_seconds,
+)
 
 # HTTP Bearer token security scheme
 security = HTTPBearer()
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def _hashing_busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy, please retry later",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return await hash_executor.run_async(
+            pwd_context.verify, plain_password, hashed_password
+        )
+    except HashingBusyError:
+        raise _hashing_busy_exception()
+
+
+async def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str,
+) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a new hash if the stored one is outdated."""
+    try:
+        return await hash_executor.run_async(
+            pwd_context.verify_and_update, plain_password, hashed_password
+        )
+    except HashingBusyError:
+        raise _hashing_busy_exception()
 
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """Hash a password."""
 
     password_bytes = password.encode("utf-8")
-    return pwd_context.hash(password_bytes)
+    try:
+        return await hash_executor.run_async(pwd_context.hash, password_bytes)
+    except HashingBusyError:
+        raise _hashing_busy_exception()
+
+
+async def get_password_hashes(passwords: List[str]) -> List[str]:
+    """Hash passwords in parallel, one executor-sized wave at a time."""
+    hashes = []
+    wave = hash_executor.max_workers
+    try:
+        for i in range(0, len(passwords), wave):
+            runs = [
+                hash_executor.run_async(pwd_context.hash, password.encode("utf-8"))
+                for password in passwords[i : i + wave]
+            ]
+            hashes.extend(await asyncio.gather(*runs))
+    except HashingBusyError:
+        raise _hashing_busy_exception()
+    return hashes
+
+
+def create_session_id() -> str:
+    """Create an identifier for a new login session (device)."""
+    return secrets.token_urlsafe(16)
 
 
 def create_access_token(
     sub: str,
     user_name: str,
+    session_id: str,
     expires_delta: Optional[timedelta] = None,
 ) -> str:
     """Create a JWT access token."""
-    to_encode = {"sub": sub, "user_name": user_name}
+    to_encode = {"sub": sub, "user_name": user_name, "sid": session_id}
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
     else:
@@ -56,17 +137,44 @@ def create_access_token(
     return encoded_jwt
 
 
-def decode_access_token(token: str) -> Optional[TokenData]:
-    """Decode and validate a JWT access token."""
+def create_refresh_token(sub: str, user_name: str, session_id: str) -> str:
+    """Create a single-use JWT refresh token for a session."""
+    expire = datetime.now(timezone.utc) + timedelta(
+        minutes=settings.jwt_refresh_token_expire_minutes
+    )
+    to_encode = {
+        "sub": sub,
+        "user_name": user_name,
+        "sid": session_id,
+        "typ": "refresh",
+        # Makes every rotated token distinct so the old one cannot be replayed
+        "jti": secrets.token_urlsafe(16),
+        "exp": expire,
+    }
+    return jwt.encode(
+        to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm
+    )
+
+
+def _decode_token(token: str, token_type: Optional[str]) -> Optional[TokenData]:
     try:
         payload = jwt.decode(
             token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm]
         )
+        if payload.get("typ") != token_type:
+            return None
         user_id: int = int(payload.get("sub"))
         user_name: str = payload.get("user_name")
+        session_id: str = payload.get("sid", "")
+        exp: Optional[int] = payload.get("exp")
         if user_id is None:
             return None
-        return TokenData(user_id=user_id, user_name=user_name)
+        return TokenData(
+            user_id=user_id,
+            user_name=user_name,
+            session_id=session_id,
+            exp=exp,
+        )
     except jwt.ExpiredSignatureError as e:
         print("Token has expired:", e)
         return None
@@ -75,45 +183,112 @@ def decode_access_token(token: str) -> Optional[TokenData]:
         return None
 
 
-def authenticate_user(
-    db: Session,
+def decode_access_token(token: str) -> Optional[TokenData]:
+    """Decode and validate a JWT access token."""
+    return _decode_token(token, None)
+
+
+def decode_refresh_token(token: str) -> Optional[TokenData]:
+    """Decode and validate a JWT refresh token."""
+    return _decode_token(token, "refresh")
+
+
+async def authenticate_user(
+    db: AsyncSession,
     email: str,
     password: str,
 ) -> Optional[User]:
     """Authenticate a user by email and password."""
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(USER_BY_EMAIL, {"email": email})
     if not user:
-        # Use dummy hash to prevent timing attacks
-        pwd_context.verify("dummy_password", get_password_hash("dummy_hash"))
+        # Verify against the dummy hash to prevent timing attacks
+        await verify_password(password, DUMMY_PASSWORD_HASH)
         return None
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = await verify_and_update_password(
+        password, user.hashed_password
+    )
+    if not verified:
         return None
+    if new_hash is not None:
+        # Transparently upgrade hashes made with outdated Argon2 parameters
+        user.hashed_password = new_hash
+        await db.commit()
     return user
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
-    """Get current authenticated user from JWT token."""
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    """Get current authenticated principal from JWT token.
+
+    With ``auth_trust_token_claims`` enabled the principal is built from the
+    verified claims alone and the users table is not queried.
+    """
     token = credentials.credentials
     token_data = decode_access_token(token)
 
     if token_data is None or token_data.user_id is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
-    # Verify token is stored in DynamoDB (not revoked)
-    if not is_token_valid(token_data.user_id, token):
-        raise credentials_exception
+    # Tokens validated recently by this container skip DynamoDB and the DB
+    principal = token_cache.get(token)
+    if principal is not None:
+        return principal
 
-    user = db.query(User).filter(User.id == token_data.user_id).first()
-    if user is None:
-        raise credentials_exception
+    # Verify token is in the token store (not revoked)
+    if not await is_token_valid(token_data.user_id, token_data.session_id, token):
+        raise _credentials_exception()
+
+    if settings.auth_trust_token_claims:
+        name = token_data.user_name
+    else:
+        user = await db.get(User, token_data.user_id)
+        if user is None:
+            raise _credentials_exception()
+        name = user.name
+    principal = Principal(
+        id=token_data.user_id,
+        name=name,
+        session_id=token_data.session_id,
+    )
+
+    token_cache.set(
+        token,
+        principal.id,
+        principal,
+        token_exp=token_data.exp,
+        session_id=principal.session_id,
+    )
+    return principal
 
+
+async def get_current_admin(
+    current_user: Principal = Depends(get_current_principal),
+) -> Principal:
+    """Dependency to require an admin user (listed in ``admin_user_ids``)."""
+    if current_user.id not in settings.admin_user_ids:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return current_user
+
+
+async def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    """Get current authenticated user row from JWT token."""
+    user = await db.get(User, principal.id)
+    if user is None:
+        raise _credentials_exception()
     return user
@@ -0,0 +1,105 @@
+"""Benchmark the sync (threadpool) and async database paths under load.
+
+Usage:
+  python -m app.commands.benchmark_db --concurrency 10,50,200
+
+Each simulated request lists shops, like ``GET /shop``: the sync path runs
+the query on the AnyIO threadpool (as a ``def`` route would), the async path
+awaits it on the aiomysql engine (as an ``async def`` route does). Both use
+the configured DATABASE_URL.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List, Optional
+
+from anyio import to_thread
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal, SessionLocal, async_engine, engine
+from app.models import Shop
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+    return ordered[index]
+
+
+def _list_shops_sync(limit: int) -> int:
+    db = SessionLocal()
+    try:
+        return len(db.scalars(select(Shop).limit(limit)).all())
+    finally:
+        db.close()
+
+
+async def _list_shops_async(limit: int) -> int:
+    async with AsyncSessionLocal() as db:
+        return len((await db.scalars(select(Shop).limit(limit))).all())
+
+
+async def run_workload(
+    mode: str,
+    requests: int,
+    concurrency: int,
+    limit: int,
+) -> Dict[str, float]:
+    """Run ``requests`` shop listings, ``concurrency`` at a time."""
+    samples: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request() -> None:
+        async with semaphore:
+            started_at = time.perf_counter()
+            if mode == "sync":
+                await run_in_threadpool(_list_shops_sync, limit)
+            else:
+                await _list_shops_async(limit)
+            samples.append((time.perf_counter() - started_at) * 1000)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(requests)))
+    elapsed = time.perf_counter() - started_at
+    return {
+        "requests_per_sec": requests / elapsed,
+        "p50_ms": statistics.median(samples),
+        "p99_ms": _percentile(samples, 99),
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    threads = to_thread.current_default_thread_limiter().total_tokens
+    print(f"threadpool: {threads} threads, pool: {engine.pool.status()}")
+    try:
+        for concurrency in (int(c) for c in args.concurrency.split(",")):
+            for mode in args.modes.split(","):
+                # Warm up connections so pool growth is not measured
+                await run_workload(mode, concurrency, concurrency, args.limit)
+                stats = await run_workload(mode, args.requests, concurrency, args.limit)
+                print(
+                    f"{mode:<5} concurrency {concurrency:>4}: "
+                    f"{stats['requests_per_sec']:.0f} req/s  "
+                    f"p50 {stats['p50_ms']:.2f} ms  p99 {stats['p99_ms']:.2f} ms"
+                )
+    finally:
+        engine.dispose()
+        await async_engine.dispose()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", default="sync,async")
+    parser.add_argument("--concurrency", default="10,50,200")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args(argv)
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,104 @@
+"""Benchmark the account entry list as ORM objects and as Core rows to JSON.
+
+Usage:
+  python -m app.commands.benchmark_entry_list --shop-id 1 --limit 5000
+
+Builds one page of a shop's entries (use a shop with at least ``limit``
+entries) against the configured DATABASE_URL in three ways and prints
+rows/sec:
+
+- ``orm``: ``ShopAccountEntry`` objects validated and dumped through
+  ``ShopAccountEntryResponse``, as FastAPI does with ``response_model``.
+- ``json``: the Core rows of ``repository.entry_page`` encoded with the
+  stdlib ``json`` module.
+- ``rows``: the same rows encoded by ``RowEncoder`` (orjson), as the
+  endpoint does.
+
+Exits non-zero if the JSON bodies differ.
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, engine
+from app.models import ShopAccountEntry
+from app.repository import ENTRY_ORDER, entry_page
+from app.routers.shop_account_entry import entry_encoder
+from app.schemas import ShopAccountEntryResponse
+
+entry_list_adapter = TypeAdapter(List[ShopAccountEntryResponse])
+
+
+def orm_page(db: Session, shop_id: int, limit: int) -> bytes:
+    stmt = (
+        select(ShopAccountEntry)
+        .where(ShopAccountEntry.shop_id == shop_id)
+        .order_by(*ENTRY_ORDER)
+        .limit(limit)
+    )
+    entries = db.scalars(stmt).all()
+    content = entry_list_adapter.dump_json(entry_list_adapter.validate_python(entries))
+    db.expunge_all()
+    return content
+
+
+def rows_page(db: Session, shop_id: int, limit: int) -> bytes:
+    stmt, params = entry_page(shop_id, limit, 0, None)
+    return entry_encoder.encode(db.execute(stmt, params).all())
+
+
+def _stdlib_default(value):
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def json_page(db: Session, shop_id: int, limit: int) -> bytes:
+    stmt, params = entry_page(shop_id, limit, 0, None)
+    items = [row._asdict() for row in db.execute(stmt, params).all()]
+    return json.dumps(
+        items, default=_stdlib_default, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def measure(page: Callable[[], bytes], requests: int, rows: int) -> float:
+    """Get rows per second."""
+    started_at = time.perf_counter()
+    for _ in range(requests):
+        page()
+    return rows * requests / (time.perf_counter() - started_at)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shop-id", type=int, default=1)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        pages = {
+            "orm": lambda: orm_page(db, args.shop_id, args.limit),
+            "json": lambda: json_page(db, args.shop_id, args.limit),
+            "rows": lambda: rows_page(db, args.shop_id, args.limit),
+        }
+        contents = {name: page() for name, page in pages.items()}
+        rows = len(entry_list_adapter.validate_json(contents["rows"]))
+        identical = len(set(contents.values())) == 1
+        print(f"{rows} rows per page, identical JSON: {'yes' if identical else 'NO'}")
+        for name, page in pages.items():
+            print(f"{name:<5} {measure(page, args.requests, rows):10.0f} rows/s")
+    finally:
+        db.close()
+        engine.dispose()
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
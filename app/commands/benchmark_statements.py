@@ -0,0 +1,107 @@
+"""Benchmark the Python CPU of hot queries as select() and pre-built statements.
+
+Usage:
+  python -m app.commands.benchmark_statements --requests 5000
+
+Runs each hot query of the routers both rebuilt as a plain ``select()`` on
+every call (as before) and as the pre-built statement from
+``app.repository``, against the configured DATABASE_URL, and prints the
+process CPU time per call. Both include the same driver and ORM row work,
+so the difference is the statement building and cache keying saved.
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import exists, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, engine
+from app.models import Shop, ShopAccountEntry, User
+from app.pagination import keyset_after
+from app.repository import (
+    ENTRY_COLUMNS,
+    ENTRY_OF_SHOP,
+    ENTRY_ORDER,
+    SHOP_EXISTS,
+    USER_BY_EMAIL,
+    entry_page,
+    shop_page,
+)
+
+# name: (plain select() builder, repository statement and parameters),
+# both by request number
+QUERIES: Dict[str, Tuple[Callable, Callable]] = {
+    "user_by_email": (
+        lambda i: select(User).where(User.email == f"user{i}@example.com"),
+        lambda i: (USER_BY_EMAIL, {"email": f"user{i}@example.com"}),
+    ),
+    "shop_exists": (
+        lambda i: select(exists().where(Shop.id == i)),
+        lambda i: (SHOP_EXISTS, {"shop_id": i}),
+    ),
+    "shop_page": (
+        lambda i: select(Shop).where(Shop.id > i).order_by(Shop.id).limit(100),
+        lambda i: shop_page(100, 0, [i]),
+    ),
+    "entry_of_shop": (
+        lambda i: select(ShopAccountEntry).where(
+            ShopAccountEntry.id == i, ShopAccountEntry.shop_id == 1
+        ),
+        lambda i: (ENTRY_OF_SHOP, {"shop_id": 1, "entry_id": i}),
+    ),
+    "entry_page": (
+        lambda i: select(*ENTRY_COLUMNS)
+        .where(ShopAccountEntry.__table__.c.shop_id == 1)
+        .where(keyset_after(ENTRY_ORDER, [2024, 1, 1, i]))
+        .order_by(*ENTRY_ORDER)
+        .limit(100),
+        lambda i: entry_page(1, 100, 0, [2024, 1, 1, i]),
+    ),
+}
+
+
+def _plain(build: Callable) -> Callable:
+    return lambda i: (build(i), None)
+
+
+def measure(db: Session, build: Callable, requests: int) -> float:
+    """Get the process CPU time per call in microseconds."""
+    started_at = time.process_time()
+    for i in range(requests):
+        stmt, params = build(i % 100 + 1)
+        db.execute(stmt, params).all()
+        db.expunge_all()
+    return (time.process_time() - started_at) / requests * 1_000_000
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", default=",".join(QUERIES))
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        for name in args.queries.split(","):
+            plain, prebuilt = QUERIES[name]
+            plain = _plain(plain)
+            # Warm up the compiled SQL cache
+            measure(db, plain, 100)
+            measure(db, prebuilt, 100)
+            plain_us = measure(db, plain, args.requests)
+            prebuilt_us = measure(db, prebuilt, args.requests)
+            print(
+                f"{name:<14} select {plain_us:7.1f} us"
+                f"  pre-built {prebuilt_us:7.1f} us"
+                f"  saved {plain_us - prebuilt_us:6.1f} us/call"
+            )
+    finally:
+        db.close()
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
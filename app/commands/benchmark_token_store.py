@@ -0,0 +1,239 @@
+"""Benchmark token store backends with a login/validate/refresh/logout workload.
+
+Usage:
+  python -m app.commands.benchmark_token_store --backends memory,sqlite,mysql
+
+Each simulated session stores a token (login), validates it a number of
+times (authenticated requests), rotates its refresh token a number of times
+(refresh) and deletes it (logout). The dynamodb and mysql backends use the
+configured DYNAMODB_* and DATABASE_URL settings.
+
+Then the CPU time of renewing an expired access token is compared between
+``/auth/refresh`` (JWT decode, new token pair, conditional write) and
+``/auth/login`` again (Argon2 verify with the configured parameters, new
+token pair, write), per hour of an active session: a session renews once
+every JWT_ACCESS_TOKEN_EXPIRE_MINUTES.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List, Optional
+
+from app.auth import (
+    create_access_token,
+    create_refresh_token,
+    decode_refresh_token,
+    pwd_context,
+)
+from app.config import get_settings
+from app.dynamodb import close_dynamodb_client
+from app.token_store import create_token_store
+
+settings = get_settings()
+
+PASSWORD = "benchmark-password"
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+    return ordered[index]
+
+
+async def run_workload(
+    backend: str,
+    sessions: int,
+    validations: int,
+    concurrency: int,
+    refreshes: int = 0,
+) -> Dict[str, Dict[str, float]]:
+    """Run the workload against one backend and get latency stats per op."""
+    store = create_token_store(backend)
+    timings: Dict[str, List[float]] = {
+        "login": [],
+        "validate": [],
+        "refresh": [],
+        "logout": [],
+    }
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(op: str, coro):
+        started_at = time.perf_counter()
+        result = await coro
+        timings[op].append((time.perf_counter() - started_at) * 1000)
+        return result
+
+    async def session(user_id: int) -> None:
+        session_id = f"benchmark-{time.time_ns()}"
+        token = f"benchmark-token-{user_id}-{session_id}"
+        refresh_token = f"benchmark-refresh-{user_id}-{session_id}-0"
+        async with semaphore:
+            await timed(
+                "login", store.store(user_id, session_id, token, 300, refresh_token)
+            )
+            for _ in range(validations):
+                valid = await timed(
+                    "validate", store.is_valid(user_id, session_id, token)
+                )
+                if not valid:
+                    raise RuntimeError(f"{backend}: stored token did not validate")
+            for i in range(1, refreshes + 1):
+                token = f"benchmark-token-{user_id}-{session_id}-{i}"
+                new_refresh_token = f"benchmark-refresh-{user_id}-{session_id}-{i}"
+                rotated = await timed(
+                    "refresh",
+                    store.rotate(
+                        user_id,
+                        session_id,
+                        refresh_token,
+                        token,
+                        new_refresh_token,
+                        300,
+                    ),
+                )
+                if not rotated or not await store.is_valid(user_id, session_id, token):
+                    raise RuntimeError(f"{backend}: refresh token did not rotate")
+                refresh_token = new_refresh_token
+            await timed("logout", store.delete(user_id, session_id))
+
+    started_at = time.perf_counter()
+    try:
+        await asyncio.gather(*(session(1_000_000 + i) for i in range(sessions)))
+        elapsed = time.perf_counter() - started_at
+        store_stats = store.stats()
+    finally:
+        await store.close()
+        await close_dynamodb_client()
+
+    results = {
+        op: {
+            "count": len(samples),
+            "p50_ms": statistics.median(samples),
+            "p99_ms": _percentile(samples, 99),
+        }
+        for op, samples in timings.items()
+        if samples
+    }
+    total_ops = sum(len(samples) for samples in timings.values())
+    results["total"] = {
+        "count": total_ops,
+        "ops_per_sec": total_ops / elapsed,
+        "elapsed_s": elapsed,
+    }
+    if store_stats:
+        results["store"] = store_stats
+    return results
+
+
+async def measure_renewal_cpu(backend: str, renewals: int) -> Dict[str, float]:
+    """Get the CPU milliseconds per renewal of an access token, by path.
+
+    Renewals run one at a time, so the process CPU time (all threads) is
+    theirs alone.
+    """
+    store = create_token_store(backend)
+    hashed_password = pwd_context.hash(PASSWORD)
+    expire_seconds = settings.jwt_refresh_token_expire_minutes * 60
+    sessions = [(2_000_000 + i, f"benchmark-{time.time_ns()}") for i in range(renewals)]
+    refresh_tokens = {}
+    for user_id, session_id in sessions:
+        refresh_token = create_refresh_token(str(user_id), "benchmark", session_id)
+        token = create_access_token(str(user_id), "benchmark", session_id)
+        await store.store(user_id, session_id, token, expire_seconds, refresh_token)
+        refresh_tokens[user_id] = refresh_token
+
+    async def relogin(user_id: int, session_id: str) -> None:
+        if not pwd_context.verify(PASSWORD, hashed_password):
+            raise RuntimeError("benchmark password did not verify")
+        token = create_access_token(str(user_id), "benchmark", session_id)
+        refresh_token = create_refresh_token(str(user_id), "benchmark", session_id)
+        await store.store(user_id, session_id, token, expire_seconds, refresh_token)
+
+    async def refresh(user_id: int, session_id: str) -> None:
+        token_data = decode_refresh_token(refresh_tokens[user_id])
+        token = create_access_token(str(user_id), token_data.user_name, session_id)
+        refresh_token = create_refresh_token(
+            str(user_id), token_data.user_name, session_id
+        )
+        if not await store.rotate(
+            user_id,
+            session_id,
+            refresh_tokens[user_id],
+            token,
+            refresh_token,
+            expire_seconds,
+        ):
+            raise RuntimeError(f"{backend}: refresh token did not rotate")
+        refresh_tokens[user_id] = refresh_token
+
+    cpu_ms = {}
+    try:
+        # Refresh first: relogin stores refresh tokens the benchmark does not keep
+        for name, renew in (("refresh", refresh), ("relogin", relogin)):
+            started_at = time.process_time()
+            for user_id, session_id in sessions:
+                await renew(user_id, session_id)
+            cpu_ms[name] = (time.process_time() - started_at) * 1000 / renewals
+        for user_id, session_id in sessions:
+            await store.delete(user_id, session_id)
+    finally:
+        await store.close()
+        await close_dynamodb_client()
+    return cpu_ms
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", default="memory,sqlite")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--validations", type=int, default=20)
+    parser.add_argument("--refreshes", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--renewals",
+        type=int,
+        default=20,
+        help="renewals per path in the refresh vs re-login CPU comparison (0: skip)",
+    )
+    args = parser.parse_args(argv)
+    renewals_per_hour = 60 / settings.jwt_access_token_expire_minutes
+
+    for backend in args.backends.split(","):
+        results = asyncio.run(
+            run_workload(
+                backend.strip(),
+                sessions=args.sessions,
+                validations=args.validations,
+                concurrency=args.concurrency,
+                refreshes=args.refreshes,
+            )
+        )
+        total = results.pop("total")
+        store_stats = results.pop("store", {})
+        print(
+            f"{backend}: {total['ops_per_sec']:.0f} ops/s "
+            f"({total['count']} ops in {total['elapsed_s']:.2f} s)"
+        )
+        for op, stats in results.items():
+            print(
+                f"  {op:<8} p50 {stats['p50_ms']:.3f} ms  p99 {stats['p99_ms']:.3f} ms"
+            )
+        for name, value in store_stats.items():
+            print(f"  {name}: {value:g}")
+        if args.renewals:
+            cpu_ms = asyncio.run(measure_renewal_cpu(backend.strip(), args.renewals))
+            for name, ms in cpu_ms.items():
+                print(
+                    f"  {name:<8} CPU {ms:.3f} ms/renewal, "
+                    f"{ms * renewals_per_hour:.3f} ms per active session-hour"
+                )
+            print(
+                f"  relogin/refresh CPU: {cpu_ms['relogin'] / cpu_ms['refresh']:.0f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
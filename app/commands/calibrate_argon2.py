@@ -0,0 +1,118 @@
+"""Benchmark Argon2 parameters on this host and pick ones meeting a target.
+
+Usage:
+  python -m app.commands.calibrate_argon2 --target-ms 250
+
+Prints the chosen parameters as environment variables. Run it on the same
+Lambda memory size as production (CPU share scales with memory).
+"""
+
+import argparse
+import statistics
+import time
+from typing import List, Optional, Tuple
+
+from passlib.hash import argon2
+
+from app.config import get_settings
+from app.hashing import get_available_memory_bytes
+
+settings = get_settings()
+
+DEFAULT_MEMORY_COSTS = "19456,32768,47104,65536,98304"
+DEFAULT_TIME_COSTS = "1,2,3,4"
+
+
+def _parse_ints(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def measure(time_cost: int, memory_cost: int, parallelism: int, rounds: int) -> float:
+    """Get the median hash latency in milliseconds."""
+    handler = argon2.using(
+        time_cost=time_cost,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+    )
+    samples = []
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        handler.hash("calibration-password")
+        samples.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(samples)
+
+
+def calibrate(
+    target_ms: float,
+    memory_costs: List[int],
+    time_costs: List[int],
+    parallelism: int,
+    max_memory_kib: int,
+    rounds: int,
+) -> Tuple[Optional[Tuple[int, int]], List[Tuple[int, int, float]]]:
+    """Benchmark every combination and pick the strongest within target.
+
+    Strength is approximated by ``time_cost * memory_cost`` (total memory
+    passes); ties go to the lower latency.
+    """
+    results = []
+    best = None
+    best_key = None
+    for memory_cost in sorted(memory_costs):
+        if memory_cost > max_memory_kib:
+            continue
+        for time_cost in sorted(time_costs):
+            elapsed_ms = measure(time_cost, memory_cost, parallelism, rounds)
+            results.append((time_cost, memory_cost, elapsed_ms))
+            print(f"t={time_cost} m={memory_cost} p={parallelism}: {elapsed_ms:.1f} ms")
+            if elapsed_ms > target_ms:
+                # Higher time costs only get slower for this memory cost
+                break
+            key = (time_cost * memory_cost, -elapsed_ms)
+            if best_key is None or key > best_key:
+                best, best_key = (time_cost, memory_cost), key
+    return best, results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--memory-costs", default=DEFAULT_MEMORY_COSTS)
+    parser.add_argument("--time-costs", default=DEFAULT_TIME_COSTS)
+    parser.add_argument("--parallelism", type=int, default=settings.argon2_parallelism)
+    parser.add_argument(
+        "--max-memory-mb",
+        type=int,
+        default=0,
+        help="Upper bound for memory_cost (default: a quarter of available)",
+    )
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    max_memory_kib = (
+        args.max_memory_mb * 1024
+        if args.max_memory_mb
+        else get_available_memory_bytes() // 4 // 1024
+    )
+    best, _ = calibrate(
+        target_ms=args.target_ms,
+        memory_costs=_parse_ints(args.memory_costs),
+        time_costs=_parse_ints(args.time_costs),
+        parallelism=args.parallelism,
+        max_memory_kib=max_memory_kib,
+        rounds=args.rounds,
+    )
+    if best is None:
+        print(f"No combination meets {args.target_ms} ms on this host")
+        return 1
+
+    time_cost, memory_cost = best
+    print()
+    print(f"ARGON2_TIME_COST={time_cost}")
+    print(f"ARGON2_MEMORY_COST={memory_cost}")
+    print(f"ARGON2_PARALLELISM={args.parallelism}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
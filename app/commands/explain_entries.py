@@ -0,0 +1,140 @@
+"""Check that account entry queries use the shop/period index (EXPLAIN).
+
+Usage:
+  python -m app.commands.explain_entries
+
+Runs EXPLAIN for the listing and aggregation queries on shop_account_entries
+against the configured DATABASE_URL and exits non-zero if any of them does
+not use ``uq_shop_account_entries_shop_period``, or on MySQL reads more
+yearly partitions than the years it asks for. Works on MySQL (EXPLAIN) and
+SQLite (EXPLAIN QUERY PLAN, no partitions).
+"""
+
+import argparse
+import re
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Select
+
+from app.database import engine
+from app.models import ShopAccountEntry
+from app.repository import entry_page
+
+INDEX_NAME = "uq_shop_account_entries_shop_period"
+
+
+# Years a query asks for; None when it cannot be limited to some partitions
+Query = Tuple[Select, Optional[range]]
+
+
+def _entry_page(*args) -> Select:
+    stmt, params = entry_page(*args)
+    return stmt.params(params)
+
+
+def get_queries(shop_id: int, year: int) -> Dict[str, Query]:
+    """Get the queries whose plans must use the index, by name."""
+    years = range(year - 1, year + 1)
+    year_from, year_to = years.start, years.stop - 1
+    after = [year, 1, 1, 1]
+    return {
+        "list": (_entry_page(shop_id, 100, 0, None), None),
+        "list_after_cursor": (_entry_page(shop_id, 100, 0, after), None),
+        "list_period": (
+            _entry_page(shop_id, 100, 0, None, year_from, year_to),
+            years,
+        ),
+        "list_period_after_cursor": (
+            _entry_page(shop_id, 100, 0, after, year_from, year_to),
+            years,
+        ),
+        "period_title": (
+            select(ShopAccountEntry).where(
+                ShopAccountEntry.shop_id == shop_id,
+                ShopAccountEntry.year == year,
+                ShopAccountEntry.month == 1,
+                ShopAccountEntry.shop_account_title_id == 1,
+            ),
+            range(year, year + 1),
+        ),
+        "sum_by_title": (
+            select(
+                ShopAccountEntry.shop_account_title_id,
+                func.sum(ShopAccountEntry.amount),
+            )
+            .where(
+                ShopAccountEntry.shop_id == shop_id,
+                ShopAccountEntry.year == year,
+            )
+            .group_by(ShopAccountEntry.shop_account_title_id),
+            range(year, year + 1),
+        ),
+        "sum_by_month": (
+            select(
+                ShopAccountEntry.year,
+                ShopAccountEntry.month,
+                func.sum(ShopAccountEntry.amount),
+            )
+            .where(
+                ShopAccountEntry.shop_id == shop_id,
+                ShopAccountEntry.year.between(year_from, year_to),
+            )
+            .group_by(ShopAccountEntry.year, ShopAccountEntry.month),
+            years,
+        ),
+    }
+
+
+def explain(conn: Connection, stmt: Select) -> Tuple[List[str], List[str]]:
+    """Get the indexes and the partitions the plan of ``stmt`` reads."""
+    sql = str(
+        stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    )
+    if conn.dialect.name == "sqlite":
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")).mappings()
+        indexes = [
+            match.group(1)
+            for row in rows
+            for match in [re.search(r"USING (?:COVERING )?INDEX (\w+)", row["detail"])]
+            if match
+        ]
+        return indexes, []
+    # The partitions column replaces EXPLAIN PARTITIONS since MySQL 5.7
+    rows = conn.execute(text(f"EXPLAIN {sql}")).mappings().all()
+    indexes = [row["key"] for row in rows if row["key"]]
+    partitions = [
+        partition
+        for row in rows
+        if row["partitions"]
+        for partition in row["partitions"].split(",")
+    ]
+    return indexes, partitions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shop-id", type=int, default=1)
+    parser.add_argument("--year", type=int, default=2024)
+    args = parser.parse_args(argv)
+
+    failed = 0
+    with engine.connect() as conn:
+        for name, (stmt, years) in get_queries(args.shop_id, args.year).items():
+            indexes, partitions = explain(conn, stmt)
+            # Each year lives in one partition
+            ok = INDEX_NAME in indexes and (
+                years is None or len(set(partitions)) <= len(years)
+            )
+            failed += not ok
+            print(
+                f"{'ok  ' if ok else 'FAIL'} {name}: {', '.join(indexes) or '-'}"
+                f" (partitions: {', '.join(partitions) or '-'})"
+            )
+    engine.dispose()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
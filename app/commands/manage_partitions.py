@@ -0,0 +1,132 @@
+"""Add and detach the yearly partitions of shop_account_entries (MySQL).
+
+Usage:
+  python -m app.commands.manage_partitions                  # up to next year
+  python -m app.commands.manage_partitions --until 2030
+  python -m app.commands.manage_partitions --detach-before 2021 --dry-run
+
+Partition ``pYYYY`` holds year YYYY (the first one also every older year)
+and ``p_future`` catches the years after the last one, so inserts never
+fail. New years are split off ``p_future``; run this before the year
+starts, while ``p_future`` is still empty, and that is a quick metadata
+change. Detaching exchanges a partition into a plain
+``shop_account_entries_pYYYY`` table, kept as an archive, and drops it.
+"""
+
+import argparse
+from datetime import datetime, timezone
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.database import engine
+
+TABLE_NAME = "shop_account_entries"
+FUTURE_PARTITION = "p_future"
+
+
+class Partition(NamedTuple):
+    name: str
+    # VALUES LESS THAN bound; None for MAXVALUE
+    less_than: Optional[int]
+    rows: int
+
+
+def get_partitions(conn: Connection) -> List[Partition]:
+    """Get the table's partitions in order."""
+    rows = conn.execute(
+        text(
+            "SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS"
+            " FROM information_schema.PARTITIONS"
+            " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+            " ORDER BY PARTITION_ORDINAL_POSITION"
+        ),
+        {"table_name": TABLE_NAME},
+    ).all()
+    if not rows or rows[0][0] is None:
+        raise RuntimeError(f"{TABLE_NAME} is not partitioned; run the migrations")
+    return [
+        Partition(
+            name=name,
+            less_than=None if bound == "MAXVALUE" else int(bound),
+            rows=table_rows or 0,
+        )
+        for name, bound, table_rows in rows
+    ]
+
+
+def get_add_statements(partitions: List[Partition], until_year: int) -> List[str]:
+    """Get the DDL splitting the years up to ``until_year`` off ``p_future``."""
+    bounds = [p.less_than for p in partitions if p.less_than is not None]
+    first_year = bounds[-1] if bounds else until_year
+    if first_year > until_year:
+        return []
+    definitions = [
+        f"PARTITION p{year} VALUES LESS THAN ({year + 1})"
+        for year in range(first_year, until_year + 1)
+    ]
+    definitions.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN MAXVALUE")
+    return [
+        f"ALTER TABLE {TABLE_NAME} REORGANIZE PARTITION {FUTURE_PARTITION}"
+        f" INTO ({', '.join(definitions)})"
+    ]
+
+
+def get_detach_statements(partitions: List[Partition], before_year: int) -> List[str]:
+    """Get the DDL moving the partitions of years before ``before_year`` out."""
+    statements = []
+    for partition in partitions:
+        if partition.less_than is None or partition.less_than > before_year:
+            continue
+        archive = f"{TABLE_NAME}_{partition.name}"
+        statements += [
+            f"CREATE TABLE {archive} LIKE {TABLE_NAME}",
+            f"ALTER TABLE {archive} REMOVE PARTITIONING",
+            f"ALTER TABLE {TABLE_NAME} EXCHANGE PARTITION {partition.name}"
+            f" WITH TABLE {archive}",
+            f"ALTER TABLE {TABLE_NAME} DROP PARTITION {partition.name}",
+        ]
+    return statements
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--until",
+        type=int,
+        default=datetime.now(timezone.utc).year + 1,
+        help="add partitions up to this year (default: next year)",
+    )
+    parser.add_argument(
+        "--detach-before",
+        type=int,
+        help="detach the partitions of the years before this one",
+    )
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    if engine.dialect.name != "mysql":
+        print(f"{TABLE_NAME} is only partitioned on MySQL")
+        return 1
+
+    try:
+        with engine.connect() as conn:
+            partitions = get_partitions(conn)
+            statements = get_add_statements(partitions, args.until)
+            if args.detach_before is not None:
+                statements += get_detach_statements(partitions, args.detach_before)
+            for statement in statements:
+                print(statement)
+                if not args.dry_run:
+                    conn.execute(text(statement))
+            for partition in get_partitions(conn):
+                bound = partition.less_than or "MAXVALUE"
+                print(f"{partition.name:<10} < {bound:<8} ~{partition.rows} rows")
+    finally:
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
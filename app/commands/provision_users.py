@@ -0,0 +1,108 @@
+"""Create users in bulk from a CSV file, hashing passwords in parallel.
+
+Usage:
+  python -m app.commands.provision_users users.csv
+
+The CSV needs a header row with ``name``, ``email`` and ``password``
+columns. Prints one result per row (created / skipped with the reason);
+invalid rows are reported and nothing is created until they are fixed.
+"""
+
+import argparse
+import asyncio
+import csv
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from pydantic import ValidationError
+
+from app.auth import pwd_context
+from app.config import get_settings
+from app.database import AsyncSessionLocal, async_engine
+from app.hashing import get_hash_concurrency
+from app.provisioning import provision_users
+from app.schemas import BulkUserResult, UserCreate
+
+settings = get_settings()
+
+
+def _hash_password(password: str) -> str:
+    return pwd_context.hash(password.encode("utf-8"))
+
+
+def read_users(path: str) -> List[UserCreate]:
+    """Read and validate users from a CSV file."""
+    users = []
+    errors = []
+    with open(path, newline="") as f:
+        # Line 1 is the header
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                users.append(UserCreate(**row))
+            except ValidationError as e:
+                fields = ", ".join(str(err["loc"][0]) for err in e.errors())
+                errors.append(f"line {line}: invalid {fields}")
+    if errors:
+        raise ValueError("\n".join(errors))
+    return users
+
+
+async def provision(
+    users: List[UserCreate], workers: int, batch_size: int
+) -> List[BulkUserResult]:
+    """Provision users, hashing their passwords on a process pool."""
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+
+        def map_hashes(passwords: List[str]) -> List[str]:
+            chunksize = max(1, len(passwords) // (workers * 4))
+            return list(executor.map(_hash_password, passwords, chunksize=chunksize))
+
+        async def hash_passwords(passwords: List[str]) -> List[str]:
+            return await loop.run_in_executor(None, map_hashes, passwords)
+
+        try:
+            async with AsyncSessionLocal() as db:
+                return await provision_users(db, users, hash_passwords, batch_size)
+        finally:
+            await async_engine.dispose()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Hashing processes (default: as many as fit in memory)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.bulk_register_batch_size
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        users = read_users(args.path)
+    except ValueError as e:
+        print(e)
+        return 1
+
+    workers = args.workers or get_hash_concurrency(
+        pwd_context.handler().memory_cost,
+        settings.password_hash_memory_reserve_mb * 1024 * 1024,
+    )
+    results = asyncio.run(provision(users, workers, args.batch_size))
+
+    for result in results:
+        if result.created:
+            print(f"{result.index}\t{result.email}\tcreated\tid={result.id}")
+        else:
+            print(f"{result.index}\t{result.email}\tskipped\t{result.detail}")
+    created = sum(result.created for result in results)
+    print(f"Created {created} of {len(results)} users")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
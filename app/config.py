@@ -1,6 +1,7 @@
 """Application configuration using pydantic-settings."""
 
 from functools import lru_cache
+from typing import List
 
 from pydantic_settings import BaseSettings
 
@@ -12,15 +13,79 @@ class Settings(BaseSettings):
 
     # Database settings for AWS Aurora MySQL
     database_url: str = ""
+    # Aurora reader endpoint for GET requests (empty = use the writer)
+    database_reader_url: str = ""
+    # Keep a client's reads on the writer this long after it writes
+    db_read_your_writes_seconds: float = 5.0
+
+    # Connection pool profile: lambda, rds-proxy or server
+    db_pool_profile: str = "lambda"
+    db_pool_size: int = 5
+    db_pool_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 3600
+    # lambda profile: ping a connection on checkout after this long idle
+    db_pool_ping_idle_seconds: float = 30.0
+
+    # Token store backend: dynamodb, memory, mysql or sqlite
+    token_store_backend: str = "dynamodb"
+    token_store_memory_max_size: int = 100000
+    token_store_sqlite_path: str = "user_tokens.sqlite3"
+    # Accept MySQL rows stored raw (before digests) during rollout
+    token_store_accept_legacy: bool = True
 
     # DynamoDB settings
     dynamodb_endpoint_url: str = ""
     dynamodb_table_name: str = ""
+    dynamodb_connect_timeout_seconds: float = 1.0
+    dynamodb_read_timeout_seconds: float = 2.0
+    dynamodb_max_attempts: int = 3
+    dynamodb_max_pool_connections: int = 10
 
     # JWT settings
     jwt_secret_key: str = ""
     jwt_algorithm: str = "HS256"
     jwt_access_token_expire_minutes: int = 30
+    jwt_refresh_token_expire_minutes: int = 60 * 24 * 14
+
+    # User ids allowed to call admin endpoints (JSON list, e.g. [1, 2])
+    admin_user_ids: List[int] = []
+
+    # Bulk user provisioning
+    bulk_register_max_users: int = 100
+    bulk_register_batch_size: int = 500
+
+    # Trust verified JWT claims instead of loading the users row per request
+    auth_trust_token_claims: bool = False
+
+    # Argon2 cost parameters (tune with `make argon2-calibrate`)
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536
+    argon2_parallelism: int = 4
+
+    # Password hashing executor settings (0 = size from available memory)
+    password_hash_max_concurrency: int = 0
+    password_hash_max_queue: int = 32
+    password_hash_queue_timeout_seconds: float = 5.0
+    password_hash_memory_reserve_mb: int = 128
+
+    # Login throttling (failed attempts per sliding window): memory or dynamodb
+    login_rate_limit_backend: str = "memory"
+    login_rate_limit_window_seconds: int = 900
+    login_rate_limit_max_failures_per_email: int = 5
+    login_rate_limit_max_failures_per_ip: int = 50
+    login_rate_limit_max_keys: int = 100000
+    login_rate_limit_table_name: str = ""
+
+    # Per-request SQL instrumentation (Server-Timing header always set)
+    sql_log_requests: bool = False
+    # Log statements repeated within a request (N+1 suspects); for development
+    sql_debug: bool = False
+    sql_debug_repeat_threshold: int = 3
+
+    # Token validation cache settings
+    token_cache_max_size: int = 1024
+    token_cache_ttl_seconds: int = 60
 
 
 @lru_cache()
@@ -1,24 +1,87 @@
 """Database connection and session management for AWS Aurora MySQL."""
 
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from app.config import get_settings
+from app.db_pool import PoolMetrics, get_pool_options, instrument_engine
+from app.db_routing import RoutingSession, get_last_write_at
+from app.instrumentation import instrument_sql
 
 settings = get_settings()
 
+# Pool metrics per engine, reported by /health/metrics
+pool_metrics = {
+    "sync": PoolMetrics(settings.db_pool_profile),
+    "async": PoolMetrics(settings.db_pool_profile),
+}
+
 # Create SQLAlchemy engine for Aurora MySQL
 engine = create_engine(
     settings.database_url,
-    pool_pre_ping=True,
-    pool_recycle=3600,
+    **get_pool_options(settings, pool_metrics["sync"], is_async=False),
 )
+instrument_engine(engine, pool_metrics["sync"], settings.db_pool_ping_idle_seconds)
+instrument_sql(engine)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers for the sync URL schemes
+ASYNC_DRIVERS = {"mysql": "aiomysql", "sqlite": "aiosqlite"}
+
+
+def get_async_database_url(url: str) -> str:
+    """Get the async driver variant of a database URL."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is not None:
+        parsed = parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}")
+    return parsed.render_as_string(hide_password=False)
+
+
+# Create async SQLAlchemy engine (aiomysql) for the async routers
+async_engine = create_async_engine(
+    get_async_database_url(settings.database_url),
+    **get_pool_options(settings, pool_metrics["async"], is_async=True),
+)
+instrument_engine(
+    async_engine.sync_engine,
+    pool_metrics["async"],
+    settings.db_pool_ping_idle_seconds,
+)
+instrument_sql(async_engine.sync_engine)
+
+# Create async engine for the Aurora reader endpoint, if configured
+async_reader_engine = None
+if settings.database_reader_url:
+    pool_metrics["async_reader"] = PoolMetrics(settings.db_pool_profile)
+    async_reader_engine = create_async_engine(
+        get_async_database_url(settings.database_reader_url),
+        **get_pool_options(settings, pool_metrics["async_reader"], is_async=True),
+    )
+    instrument_engine(
+        async_reader_engine.sync_engine,
+        pool_metrics["async_reader"],
+        settings.db_pool_ping_idle_seconds,
+    )
+    instrument_sql(async_reader_engine.sync_engine)
+
+# Create async session factory; rows stay readable after commit without
+# an implicit (and, under asyncio, impossible) lazy refresh
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    sync_session_class=RoutingSession,
+    reader=async_reader_engine.sync_engine if async_reader_engine else None,
+)
+
 # Base class for declarative models
 Base = declarative_base()
 
@@ -30,3 +93,16 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get async database session.
+
+    Reads of GET requests go to the reader endpoint when one is configured,
+    unless the client wrote within the read-your-writes window.
+    """
+    async with AsyncSessionLocal() as db:
+        db.info["read_only"] = request.method in ("GET", "HEAD")
+        db.info["last_write_at"] = get_last_write_at(request)
+        db.info["request_state"] = request.state
+        yield db
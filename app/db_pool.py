@@ -0,0 +1,168 @@
+"""Connection pool profiles and pool metrics for the database engines."""
+
+import threading
+import time
+from typing import Any, Dict, Union
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from app.config import Settings
+
+POOL_PROFILES = ("lambda", "rds-proxy", "server")
+
+
+class PoolMetrics:
+    """Counters for one engine's connection pool."""
+
+    def __init__(self, profile: str):
+        self.profile = profile
+        self._lock = threading.Lock()
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_total = 0.0
+        self._connects = 0
+        self._reconnects = 0
+        self._pings = 0
+
+    def record_checkout(self) -> None:
+        with self._lock:
+            self._checkouts += 1
+
+    def record_wait(self, elapsed: float) -> None:
+        with self._lock:
+            self._waits += 1
+            self._wait_total += elapsed
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self._connects += 1
+
+    def record_reconnect(self) -> None:
+        with self._lock:
+            self._reconnects += 1
+
+    def record_ping(self) -> None:
+        with self._lock:
+            self._pings += 1
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Get pool metrics."""
+        with self._lock:
+            return {
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_avg_ms": (
+                    self._wait_total / self._waits * 1000 if self._waits else 0.0
+                ),
+                "connects": self._connects,
+                "reconnects": self._reconnects,
+                "pings": self._pings,
+            }
+
+
+class _MeteredPoolMixin:
+    """Count checkouts that find every pooled connection busy, and their wait."""
+
+    metrics: PoolMetrics
+    capacity: int
+
+    def _do_get(self):
+        if self.checkedout() < self.capacity:
+            return super()._do_get()
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.metrics.record_wait(time.perf_counter() - started_at)
+
+
+def _metered_pool_class(pool_class: type, metrics: PoolMetrics, capacity: int):
+    # Class attributes survive Pool.recreate() (engine.dispose())
+    return type(
+        f"Metered{pool_class.__name__}",
+        (_MeteredPoolMixin, pool_class),
+        {"metrics": metrics, "capacity": capacity},
+    )
+
+
+def get_pool_options(
+    settings: Settings,
+    metrics: PoolMetrics,
+    is_async: bool,
+) -> Dict[str, Any]:
+    """Get ``create_engine`` pool arguments for the configured profile.
+
+    - ``lambda``: one persistent connection per container (a container
+      serves one request at a time), pinged only after it sat idle.
+    - ``rds-proxy``: no client-side pool; RDS Proxy multiplexes connections.
+    - ``server``: a sized pool with a pre-ping on every checkout.
+    """
+    profile = settings.db_pool_profile
+    queue_pool = AsyncAdaptedQueuePool if is_async else QueuePool
+    if profile == "lambda":
+        return {
+            "poolclass": _metered_pool_class(queue_pool, metrics, 1),
+            "pool_size": 1,
+            "max_overflow": 0,
+            "pool_timeout": settings.db_pool_timeout_seconds,
+            "pool_recycle": settings.db_pool_recycle_seconds,
+        }
+    if profile == "rds-proxy":
+        return {"poolclass": NullPool}
+    if profile == "server":
+        return {
+            "poolclass": _metered_pool_class(
+                queue_pool,
+                metrics,
+                settings.db_pool_size + settings.db_pool_max_overflow,
+            ),
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_pool_max_overflow,
+            "pool_timeout": settings.db_pool_timeout_seconds,
+            "pool_recycle": settings.db_pool_recycle_seconds,
+            "pool_pre_ping": True,
+        }
+    raise ValueError(f"Unknown database pool profile: {profile}")
+
+
+def instrument_engine(
+    engine: Engine,
+    metrics: PoolMetrics,
+    ping_idle_seconds: float,
+) -> None:
+    """Count pool events and, for the lambda profile, ping idle connections.
+
+    A connection that sat in the pool longer than ``ping_idle_seconds``
+    (e.g. across a frozen Lambda container) is pinged on checkout; a failed
+    ping makes the pool replace it instead of failing the request.
+    """
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.record_connect()
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.record_reconnect()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.record_checkout()
+        if metrics.profile != "lambda":
+            return
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None:
+            return
+        if time.monotonic() - checked_in_at < ping_idle_seconds:
+            return
+        metrics.record_ping()
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            raise exc.DisconnectionError(f"Idle connection is gone: {e}") from e
@@ -0,0 +1,108 @@
+"""Routing of read-only requests to the Aurora reader endpoint."""
+
+import math
+import time
+from typing import Any, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Time of the client's last write, set on write responses and sent back by
+# the client (the cookie by browsers, the header by other clients)
+LAST_WRITE_COOKIE = "last_write"
+LAST_WRITE_HEADER = "X-Last-Write"
+
+
+def get_last_write_at(request: Request) -> Optional[float]:
+    """Get the last write time the client sent, if within the window.
+
+    The value only keeps reads on the writer, so it is not signed; a value
+    in the future or outside the window is ignored.
+    """
+    value = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(
+        LAST_WRITE_COOKIE
+    )
+    if not value:
+        return None
+    try:
+        last_write_at = float(value)
+    except ValueError:
+        return None
+    if not 0 <= time.time() - last_write_at < settings.db_read_your_writes_seconds:
+        return None
+    return last_write_at
+
+
+class RoutingSession(Session):
+    """Session that sends SELECTs of read-only requests to ``reader``.
+
+    ``info["read_only"]`` marks the request as read-only and
+    ``info["last_write_at"]`` is the client's last write within the
+    read-your-writes window; everything else, including reads of a client
+    that has just written, uses the writer. After a commit that wrote,
+    ``info["request_state"].wrote_at`` is set for the response.
+    """
+
+    def __init__(self, *args: Any, reader: Optional[Engine] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.reader = reader
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            self.reader is not None
+            and self.info.get("read_only")
+            and self.info.get("last_write_at") is None
+            and isinstance(clause, Select)
+            and not self._flushing
+        ):
+            return self.reader
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _after_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _do_orm_execute(state):
+    # INSERT, UPDATE and DELETE statements write without a flush
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _after_commit(session):
+    request_state = session.info.get("request_state")
+    if session.info.pop("wrote", False) and request_state is not None:
+        request_state.wrote_at = time.time()
+
+
+async def read_your_writes_middleware(request: Request, call_next) -> Response:
+    """Hand the time of a request's write to the client to send back.
+
+    Any container can then keep the client's reads on the writer for
+    ``db_read_your_writes_seconds``, which a per-container record cannot
+    do on Lambda.
+    """
+    response = await call_next(request)
+    wrote_at = getattr(request.state, "wrote_at", None)
+    window = settings.db_read_your_writes_seconds
+    if wrote_at is not None and settings.database_reader_url and window > 0:
+        value = f"{wrote_at:.3f}"
+        response.headers[LAST_WRITE_HEADER] = value
+        response.set_cookie(
+            LAST_WRITE_COOKIE,
+            value,
+            max_age=math.ceil(window),
+            httponly=True,
+            samesite="lax",
+        )
+    return response
@@ -1,90 +1,69 @@
-"""DynamoDB connection and token storage."""
+"""DynamoDB connection management."""
 
-import time
+import asyncio
+from contextlib import AsyncExitStack
 from typing import Optional
 
-import boto3
-from botocore.exceptions import ClientError
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session
 
 from app.config import get_settings
 
 settings = get_settings()
 
-# DynamoDB resource (singleton)
-_dynamodb_resource = None
-
-
-def get_dynamodb_resource():
-    """Get DynamoDB resource (singleton)."""
-    global _dynamodb_resource
-    if _dynamodb_resource is None:
-        if settings.dynamodb_endpoint_url:
-            _dynamodb_resource = boto3.resource(
-                "dynamodb",
-                region_name=settings.aws_region,
-                endpoint_url=settings.dynamodb_endpoint_url,
-            )
-        else:
-            _dynamodb_resource = boto3.resource(
-                "dynamodb",
-                region_name=settings.aws_region,
-            )
-    return _dynamodb_resource
-
-
-def get_token_table():
-    """Get DynamoDB table for token storage."""
-    dynamodb = get_dynamodb_resource()
-    return dynamodb.Table(settings.dynamodb_table_name)
-
-
-def store_token(user_id: int, token: str, expire_seconds: int) -> bool:
-    """Store token in DynamoDB with expiration (TTL)."""
-    table = get_token_table()
-    ttl = int(time.time()) + expire_seconds
-    try:
-        table.put_item(
-            Item={
-                "user_id": str(user_id),
-                "token": token,
-                "ttl": ttl,
-            }
+# DynamoDB client (one per event loop, kept open across invocations)
+_dynamodb_client = None
+_dynamodb_client_loop = None
+_dynamodb_exit_stack: Optional[AsyncExitStack] = None
+
+
+def get_dynamodb_config() -> AioConfig:
+    """Get DynamoDB client config with timeouts, retries and pooling."""
+    return AioConfig(
+        connect_timeout=settings.dynamodb_connect_timeout_seconds,
+        read_timeout=settings.dynamodb_read_timeout_seconds,
+        retries={
+            "mode": "adaptive",
+            "max_attempts": settings.dynamodb_max_attempts,
+        },
+        max_pool_connections=settings.dynamodb_max_pool_connections,
+    )
+
+
+async def get_dynamodb_client():
+    """Get DynamoDB client (singleton per event loop)."""
+    global _dynamodb_client, _dynamodb_client_loop, _dynamodb_exit_stack
+    loop = asyncio.get_running_loop()
+    if _dynamodb_client is not None and _dynamodb_client_loop is loop:
+        return _dynamodb_client
+
+    kwargs = {"region_name": settings.aws_region or None}
+    if settings.dynamodb_endpoint_url:
+        kwargs["endpoint_url"] = settings.dynamodb_endpoint_url
+    exit_stack = AsyncExitStack()
+    client = await exit_stack.enter_async_context(
+        get_session().create_client(
+            "dynamodb",
+            config=get_dynamodb_config(),
+            **kwargs,
         )
-        return True
-    except ClientError as e:
-        print(f"Error storing token: {e}")
-        return False
-
-
-def get_stored_token(user_id: int) -> Optional[str]:
-    """Get stored token for user from DynamoDB."""
-    table = get_token_table()
-    try:
-        response = table.get_item(Key={"user_id": str(user_id)})
-        item = response.get("Item")
-        if item:
-            # Check if token has expired (in case TTL hasn't cleaned it up yet)
-            ttl = item.get("ttl", 0)
-            if ttl > int(time.time()):
-                return item.get("token")
-        return None
-    except ClientError as e:
-        print(f"Error retrieving token: {e}")
-        return None
-
-
-def delete_token(user_id: int) -> bool:
-    """Delete token from DynamoDB."""
-    table = get_token_table()
-    try:
-        table.delete_item(Key={"user_id": str(user_id)})
-        return True
-    except ClientError as e:
-        print(f"Error deleting token: {e}")
-        return False
-
-
-def is_token_valid(user_id: int, token: str) -> bool:
-    """Check if the provided token matches the stored token."""
-    stored_token = get_stored_token(user_id)
-    return stored_token == token
+    )
+    if _dynamodb_client is not None and _dynamodb_client_loop is loop:
+        # Another task created the client while this one was connecting
+        await exit_stack.aclose()
+        return _dynamodb_client
+
+    _dynamodb_client = client
+    _dynamodb_client_loop = loop
+    _dynamodb_exit_stack = exit_stack
+    return client
+
+
+async def close_dynamodb_client() -> None:
+    """Close the DynamoDB client and its connection pool."""
+    global _dynamodb_client, _dynamodb_client_loop, _dynamodb_exit_stack
+    if _dynamodb_exit_stack is not None:
+        await _dynamodb_exit_stack.aclose()
+    _dynamodb_client = None
+    _dynamodb_client_loop = None
+    _dynamodb_exit_stack = None
@@ -0,0 +1,134 @@
+"""Bounded executor for memory-hungry password hashing."""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Union
+
+
+class HashingBusyError(Exception):
+    """Raised when a hash cannot be admitted within the queue limits."""
+
+
+def get_available_memory_bytes() -> int:
+    """Get the memory available to this process.
+
+    Uses the Lambda function memory size when running on Lambda and falls
+    back to ``MemAvailable`` from ``/proc/meminfo``.
+    """
+    lambda_memory_mb = os.environ.get("AWS_LAMBDA_FUNCTION_MEMORY_SIZE")
+    if lambda_memory_mb:
+        return int(lambda_memory_mb) * 1024 * 1024
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+
+def get_hash_concurrency(memory_cost_kib: int, reserve_bytes: int) -> int:
+    """Get how many hashes fit in memory at once, capped by CPU count."""
+    per_hash_bytes = memory_cost_kib * 1024
+    by_memory = (get_available_memory_bytes() - reserve_bytes) // per_hash_bytes
+    return max(1, min(os.cpu_count() or 1, by_memory))
+
+
+class PasswordHashExecutor:
+    """Run password hashes on a dedicated, bounded thread pool.
+
+    ``max_workers`` is the admission limit: at most that many hashes hold
+    their memory at once. Up to ``max_queue`` more may wait; a hash that
+    waits longer than ``queue_timeout`` is rejected with
+    :class:`HashingBusyError` instead of being run.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, queue_timeout: float):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hash",
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._wait_total = 0.0
+        self._dequeued = 0
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Queue a hash, raising HashingBusyError if the queue is full."""
+        with self._lock:
+            pending = self._queued + self._in_flight
+            if pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise HashingBusyError("Password hash queue is full")
+            self._queued += 1
+        return self._executor.submit(self._run, time.perf_counter(), fn, args)
+
+    async def run_async(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a hash without blocking the event loop."""
+        future = self.submit(fn, *args)
+        wrapped = asyncio.wrap_future(future)
+        try:
+            return await asyncio.wait_for(asyncio.shield(wrapped), self.queue_timeout)
+        except TimeoutError:
+            self._cancel_if_queued(future)
+            return await wrapped
+
+    def _cancel_if_queued(self, future: Future) -> None:
+        if future.cancel():
+            with self._lock:
+                self._queued -= 1
+                self._rejected += 1
+            raise HashingBusyError("Timed out waiting for a hash slot")
+
+    def _run(self, queued_at: float, fn: Callable[..., Any], args: tuple) -> Any:
+        started_at = time.perf_counter()
+        waited = started_at - queued_at
+        with self._lock:
+            self._queued -= 1
+            self._dequeued += 1
+            self._wait_total += waited
+            if waited > self.queue_timeout:
+                self._rejected += 1
+                raise HashingBusyError("Timed out waiting for a hash slot")
+            self._in_flight += 1
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+                self._latency_total += elapsed
+                self._latency_max = max(self._latency_max, elapsed)
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Get executor metrics."""
+        with self._lock:
+            completed = self._completed
+            dequeued = self._dequeued
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self._queued,
+                "in_flight": self._in_flight,
+                "completed": completed,
+                "rejected": self._rejected,
+                "latency_avg_ms": (
+                    self._latency_total / completed * 1000 if completed else 0.0
+                ),
+                "latency_max_ms": self._latency_max * 1000,
+                "wait_avg_ms": (
+                    self._wait_total / dequeued * 1000 if dequeued else 0.0
+                ),
+            }
@@ -0,0 +1,110 @@
+"""Per-request SQL instrumentation: statement count, DB time and rows."""
+
+import json
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class SqlStats:
+    """SQL counters of one request."""
+
+    def __init__(self, track_statements: bool):
+        self.statements = 0
+        self.duration = 0.0
+        self.rows = 0
+        self._by_sql: Optional[Counter] = Counter() if track_statements else None
+
+    def record(self, statement: str, duration: float, rows: int) -> None:
+        self.statements += 1
+        self.duration += duration
+        self.rows += rows
+        if self._by_sql is not None:
+            self._by_sql[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Dict[str, Any]]:
+        """Get statements issued at least ``threshold`` times (N+1 suspects)."""
+        if self._by_sql is None:
+            return []
+        return [
+            {"sql": sql, "count": count}
+            for sql, count in self._by_sql.most_common()
+            if count >= threshold
+        ]
+
+
+_sql_stats: ContextVar[Optional[SqlStats]] = ContextVar("sql_stats", default=None)
+
+
+def _record(context: Any, statement: str, rows: int) -> None:
+    # Pop the start time, so a statement is recorded once
+    started_at = vars(context).pop("sql_started_at", None)
+    stats = _sql_stats.get()
+    if started_at is None or stats is None:
+        return
+    stats.record(statement, time.perf_counter() - started_at, rows)
+
+
+def instrument_sql(engine: Engine) -> None:
+    """Count the statements an engine runs into the current request's stats."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        # Kept on the execution context, which is dropped with the statement
+        # even when it fails
+        context.sql_started_at = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        # Rows of result sets only; drivers that cannot tell report -1
+        rows = cursor.rowcount if cursor.description is not None else 0
+        _record(context, statement, max(rows, 0))
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # Failed statements count too; after_cursor_execute does not run
+        context = exception_context.execution_context
+        if context is not None and exception_context.statement is not None:
+            _record(context, exception_context.statement, 0)
+
+
+async def sql_instrumentation_middleware(request: Request, call_next) -> Response:
+    """Report the SQL of each request as ``Server-Timing`` and a log line."""
+    stats = SqlStats(track_statements=settings.sql_debug)
+    token = _sql_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _sql_stats.reset(token)
+
+    duration_ms = stats.duration * 1000
+    response.headers.append(
+        "Server-Timing",
+        f'db;dur={duration_ms:.2f};desc="{stats.statements} statements, '
+        f'{stats.rows} rows"',
+    )
+
+    repeated = stats.repeated(settings.sql_debug_repeat_threshold)
+    if settings.sql_log_requests or repeated:
+        fields: Dict[str, Any] = {
+            "event": "sql",
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            "statements": stats.statements,
+            "db_ms": round(duration_ms, 2),
+            "rows": stats.rows,
+        }
+        if repeated:
+            fields["repeated_statements"] = repeated
+        print(json.dumps(fields))
+    return response
@@ -1,24 +1,50 @@
 """FastAPI application for AWS Lambda with Mangum adapter."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from mangum import Mangum
 
 from app.config import get_settings
+from app.database import async_engine, async_reader_engine
+from app.db_routing import read_your_writes_middleware
+from app.dynamodb import close_dynamodb_client
+from app.instrumentation import sql_instrumentation_middleware
 from app.routers import (
     auth_router,
     health_router,
     shop_account_entry_router,
     shop_router,
 )
+from app.token_store import get_token_store
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan: release pooled clients on shutdown."""
+    yield
+    await get_token_store().close()
+    get_token_store.cache_clear()
+    await close_dynamodb_client()
+    await async_engine.dispose()
+    if async_reader_engine is not None:
+        await async_reader_engine.dispose()
+
+
 app = FastAPI(
     title="Supermarket Task Server",
     description="Supermarket Task Server API",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Report per-request SQL as Server-Timing
+app.middleware("http")(sql_instrumentation_middleware)
+# Hand clients the time of their last write for read-your-writes routing
+app.middleware("http")(read_your_writes_middleware)
+
 # Include routers
 app.include_router(health_router)
 app.include_router(auth_router)
@@ -4,10 +4,12 @@ from app.models.shop import Shop
 from app.models.shop_account_entry import ShopAccountEntry
 from app.models.shop_account_title import ShopAccountTitle
 from app.models.user import User
+from app.models.user_token import UserToken
 
 __all__ = [
     "Shop",
     "ShopAccountTitle",
     "ShopAccountEntry",
     "User",
+    "UserToken",
 ]
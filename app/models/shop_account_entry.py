@@ -1,4 +1,4 @@
-from sqlalchemy import DECIMAL, Column, DateTime, ForeignKey, Integer, func
+from sqlalchemy import DECIMAL, Column, DateTime, Index, Integer, func
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -6,33 +6,50 @@ from app.database import Base
 
 class ShopAccountEntry(Base):
     __tablename__ = "shop_account_entries"
+    __table_args__ = (
+        # One entry per shop, period and account title. Serves lookups by
+        # shop and period range, and keyset pagination (InnoDB appends id)
+        Index(
+            "uq_shop_account_entries_shop_period",
+            "shop_id",
+            "year",
+            "month",
+            "shop_account_title_id",
+            unique=True,
+        ),
+        # Yearly partitions are added by the manage_partitions command.
+        # Partitioned InnoDB tables have no foreign keys, and every unique
+        # key (the primary key too) must include year.
+        {
+            "mysql_partition_by": (
+                "RANGE (year) (PARTITION p_future VALUES LESS THAN MAXVALUE)"
+            ),
+        },
+    )
 
     id = Column(
         Integer,
         primary_key=True,
+        autoincrement=True,
         index=True,
     )
     shop_id = Column(
         Integer,
-        ForeignKey("shops.id"),
         nullable=False,
-        index=True,
     )
     shop_account_title_id = Column(
         Integer,
-        ForeignKey("shop_account_titles.id"),
         nullable=False,
         index=True,
     )
     year = Column(
         Integer,
+        primary_key=True,
         nullable=False,
-        index=True,
     )
     month = Column(
         Integer,
         nullable=False,
-        index=True,
     )
     amount = Column(
         DECIMAL(precision=12, scale=2),
@@ -50,4 +67,8 @@ class ShopAccountEntry(Base):
         nullable=False,
     )
 
-    shop = relationship("Shop", backref="shop_account_entries")
+    shop = relationship(
+        "Shop",
+        backref="shop_account_entries",
+        primaryjoin="foreign(ShopAccountEntry.shop_id) == Shop.id",
+    )
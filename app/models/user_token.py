@@ -0,0 +1,37 @@
+from sqlalchemy import BINARY, Column, Integer, String
+
+from app.database import Base
+
+
+class UserToken(Base):
+    __tablename__ = "user_tokens"
+
+    user_id = Column(
+        Integer,
+        primary_key=True,
+        autoincrement=False,
+    )
+    # Empty for rows written before per-device sessions
+    session_id = Column(
+        String(64),
+        primary_key=True,
+        server_default="",
+    )
+    # Raw JWT, only on rows written before digests were stored
+    token = Column(
+        String(2048),
+        nullable=True,
+    )
+    token_digest = Column(
+        BINARY(32),
+        nullable=True,
+    )
+    refresh_digest = Column(
+        BINARY(32),
+        nullable=True,
+    )
+    expires_at = Column(
+        Integer,
+        nullable=False,
+        index=True,
+    )
@@ -0,0 +1,80 @@
+"""Keyset (cursor) pagination helpers."""
+
+import base64
+import json
+from typing import Any, Callable, List, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_
+from sqlalchemy.sql import ColumnElement
+
+# Response header carrying the cursor of the next page (absent on the last)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    data = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[int]:
+    """Decode a cursor into its ``size`` sort key values."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except ValueError:
+        values = None
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(type(v) is int for v in values)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    return values
+
+
+def keyset_after(
+    columns: Sequence[ColumnElement], values: Sequence[Any]
+) -> ColumnElement:
+    """Get ``(columns) > (values)`` in expanded form, which uses the index."""
+    column, value = columns[0], values[0]
+    if len(columns) == 1:
+        return column > value
+    return or_(
+        column > value,
+        and_(column == value, keyset_after(columns[1:], values[1:])),
+    )
+
+
+def get_page_after(
+    cursor: Optional[str],
+    offset: int,
+    size: int,
+) -> Optional[List[int]]:
+    """Get the sort key a page starts after, or None to page by ``offset``.
+
+    With a ``cursor`` the page starts after the row it encodes (keyset);
+    without one ``offset`` still works for existing clients.
+    """
+    if cursor is None:
+        return None
+    if offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either cursor or offset, not both",
+        )
+    return decode_cursor(cursor, size)
+
+
+def set_next_cursor(
+    response: Response,
+    rows: Sequence[Any],
+    limit: int,
+    sort_key: Callable[[Any], Sequence[Any]],
+) -> None:
+    """Set the next page cursor header if the page is full."""
+    if rows and len(rows) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(sort_key(rows[-1]))
@@ -0,0 +1,100 @@
+"""Bulk user provisioning shared by the admin endpoint and CLI."""
+
+from typing import Awaitable, Callable, List, Optional, Sequence
+
+from sqlalchemy import insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import User
+from app.schemas import BulkUserResult, UserCreate
+
+
+async def find_conflicts(
+    db: AsyncSession, users: Sequence[UserCreate]
+) -> List[Optional[str]]:
+    """Get the conflict of each user (None if it can be created).
+
+    Checks every name and email against the table in one query, and
+    against earlier rows of the same batch. Comparison is case-insensitive,
+    like the MySQL unique indexes.
+    """
+    names = {user.name for user in users}
+    emails = {user.email for user in users}
+    rows = (
+        await db.execute(
+            select(User.name, User.email).where(
+                or_(User.name.in_(names), User.email.in_(emails))
+            )
+        )
+    ).all()
+    taken_names = {row.name.lower() for row in rows}
+    taken_emails = {row.email.lower() for row in rows}
+
+    conflicts = []
+    for user in users:
+        name, email = user.name.lower(), user.email.lower()
+        if name in taken_names:
+            conflicts.append("Username already registered")
+        elif email in taken_emails:
+            conflicts.append("Email already registered")
+        else:
+            conflicts.append(None)
+        taken_names.add(name)
+        taken_emails.add(email)
+    return conflicts
+
+
+async def provision_users(
+    db: AsyncSession,
+    users: Sequence[UserCreate],
+    hash_passwords: Callable[[List[str]], Awaitable[List[str]]],
+    batch_size: int,
+) -> List[BulkUserResult]:
+    """Create users in bulk and get a result per row.
+
+    Conflicting rows are skipped before hashing. The rest are hashed with
+    ``hash_passwords`` and inserted with one executemany per ``batch_size``
+    rows, all in a single transaction.
+    """
+    conflicts = await find_conflicts(db, users)
+    new_users = [user for user, conflict in zip(users, conflicts) if not conflict]
+    hashed_passwords = await hash_passwords([user.password for user in new_users])
+
+    rows = [
+        {
+            "name": user.name,
+            "email": user.email,
+            "hashed_password": hashed_password,
+        }
+        for user, hashed_password in zip(new_users, hashed_passwords)
+    ]
+    try:
+        for i in range(0, len(rows), batch_size):
+            await db.execute(insert(User), rows[i : i + batch_size])
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    ids = {}
+    if rows:
+        ids = dict(
+            (
+                await db.execute(
+                    select(User.email, User.id).where(
+                        User.email.in_([row["email"] for row in rows])
+                    )
+                )
+            ).all()
+        )
+    return [
+        BulkUserResult(
+            index=index,
+            name=user.name,
+            email=user.email,
+            id=None if conflict else ids.get(user.email),
+            created=conflict is None,
+            detail=conflict,
+        )
+        for index, (user, conflict) in enumerate(zip(users, conflicts))
+    ]
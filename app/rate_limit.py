@@ -0,0 +1,233 @@
+"""Sliding-window throttling of failed logins."""
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import Deque, Optional, Tuple
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from app.config import get_settings
+from app.dynamodb import get_dynamodb_client
+
+settings = get_settings()
+
+
+class RateLimiter(ABC):
+    """Count failures per key over a sliding window.
+
+    A key with ``limit`` failures inside the last ``window_seconds`` is
+    rejected until enough of them fall out of the window.
+    """
+
+    def __init__(self, name: str, limit: int, window_seconds: int):
+        self.name = name
+        self.limit = limit
+        self.window_seconds = window_seconds
+
+    @abstractmethod
+    async def check(self, key: str) -> Tuple[int, bool]:
+        """Get the seconds until ``key`` is allowed again (0 if allowed now)
+        and whether it has failures in the window, i.e. anything to reset.
+        """
+
+    @abstractmethod
+    async def hit(self, key: str) -> None:
+        """Record a failure for ``key``."""
+
+    @abstractmethod
+    async def reset(self, key: str) -> None:
+        """Forget the failures recorded for ``key``."""
+
+
+class MemoryRateLimiter(RateLimiter):
+    """In-process sliding log, bounded to ``max_keys`` keys (LRU)."""
+
+    def __init__(self, name: str, limit: int, window_seconds: int, max_keys: int):
+        super().__init__(name, limit, window_seconds)
+        self.max_keys = max_keys
+        self._hits: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _trim(self, key: str, now: float) -> Optional[Deque[float]]:
+        hits = self._hits.get(key)
+        if hits is None:
+            return None
+        while hits and hits[0] <= now - self.window_seconds:
+            hits.popleft()
+        if not hits:
+            del self._hits[key]
+            return None
+        return hits
+
+    async def check(self, key: str) -> Tuple[int, bool]:
+        now = time.time()
+        with self._lock:
+            hits = self._trim(key, now)
+            if hits is None:
+                return 0, False
+            if len(hits) < self.limit:
+                return 0, True
+            return max(1, math.ceil(hits[0] + self.window_seconds - now)), True
+
+    async def hit(self, key: str) -> None:
+        now = time.time()
+        with self._lock:
+            hits = self._trim(key, now)
+            if hits is None:
+                # Only the newest ``limit`` hits can decide a rejection
+                hits = self._hits[key] = deque(maxlen=self.limit)
+            hits.append(now)
+            self._hits.move_to_end(key)
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+
+    async def reset(self, key: str) -> None:
+        with self._lock:
+            self._hits.pop(key, None)
+
+
+class DynamoDBRateLimiter(RateLimiter):
+    """Sliding window shared by all containers through a DynamoDB table.
+
+    Uses two fixed-window counters (current and previous) per key and
+    weights the previous one by how much of it still overlaps the sliding
+    window. The table has partition key ``limit_key`` (String) and a ``ttl``
+    attribute. Errors fail open so an outage does not block logins.
+    """
+
+    def __init__(self, name: str, limit: int, window_seconds: int, table_name: str):
+        super().__init__(name, limit, window_seconds)
+        self.table_name = table_name
+
+    def _key(self, key: str, window: int) -> dict:
+        return {"limit_key": {"S": f"{self.name}:{key}:{window}"}}
+
+    async def _counts(self, key: str, window: int) -> Tuple[int, int]:
+        client = await get_dynamodb_client()
+        response = await client.batch_get_item(
+            RequestItems={
+                self.table_name: {
+                    "Keys": [self._key(key, window - 1), self._key(key, window)],
+                    "ProjectionExpression": "limit_key, hit_count",
+                }
+            }
+        )
+        counts = {
+            item["limit_key"]["S"]: int(item["hit_count"]["N"])
+            for item in response["Responses"].get(self.table_name, [])
+        }
+        previous = counts.get(self._key(key, window - 1)["limit_key"]["S"], 0)
+        current = counts.get(self._key(key, window)["limit_key"]["S"], 0)
+        return previous, current
+
+    async def check(self, key: str) -> Tuple[int, bool]:
+        now = time.time()
+        window = int(now // self.window_seconds)
+        elapsed = now - window * self.window_seconds
+        try:
+            previous, current = await self._counts(key, window)
+        except (BotoCoreError, ClientError) as e:
+            print(f"Error reading rate limit: {e}")
+            return 0, False
+        failed = previous + current > 0
+        weight = 1 - elapsed / self.window_seconds
+        if previous * weight + current < self.limit:
+            return 0, failed
+        if current >= self.limit:
+            # Wait for the next window, then for this one to decay enough
+            wait = self.window_seconds - elapsed
+            wait += self.window_seconds * (1 - self.limit / current)
+        else:
+            wait = (
+                self.window_seconds * (1 - (self.limit - current) / previous) - elapsed
+            )
+        return max(1, math.ceil(wait)), failed
+
+    async def hit(self, key: str) -> None:
+        now = time.time()
+        window = int(now // self.window_seconds)
+        ttl = (window + 2) * self.window_seconds
+        client = await get_dynamodb_client()
+        try:
+            await client.update_item(
+                TableName=self.table_name,
+                Key=self._key(key, window),
+                UpdateExpression="ADD hit_count :one SET #ttl = :ttl",
+                ExpressionAttributeNames={"#ttl": "ttl"},
+                ExpressionAttributeValues={
+                    ":one": {"N": "1"},
+                    ":ttl": {"N": str(ttl)},
+                },
+            )
+        except (BotoCoreError, ClientError) as e:
+            print(f"Error recording rate limit hit: {e}")
+
+    async def reset(self, key: str) -> None:
+        window = int(time.time() // self.window_seconds)
+        client = await get_dynamodb_client()
+        try:
+            await client.batch_write_item(
+                RequestItems={
+                    self.table_name: [
+                        {"DeleteRequest": {"Key": self._key(key, w)}}
+                        for w in (window - 1, window)
+                    ]
+                }
+            )
+        except (BotoCoreError, ClientError) as e:
+            print(f"Error resetting rate limit: {e}")
+
+
+def create_rate_limiter(name: str, limit: int) -> RateLimiter:
+    """Create a limiter on the backend selected by ``login_rate_limit_backend``."""
+    window_seconds = settings.login_rate_limit_window_seconds
+    backend = settings.login_rate_limit_backend
+    if backend == "memory":
+        return MemoryRateLimiter(
+            name, limit, window_seconds, settings.login_rate_limit_max_keys
+        )
+    if backend == "dynamodb":
+        return DynamoDBRateLimiter(
+            name, limit, window_seconds, settings.login_rate_limit_table_name
+        )
+    raise ValueError(f"Unknown rate limit backend: {backend}")
+
+
+@lru_cache()
+def get_login_limiters() -> Tuple[RateLimiter, RateLimiter]:
+    """Get the (email, client IP) login failure limiters (singletons)."""
+    return (
+        create_rate_limiter("email", settings.login_rate_limit_max_failures_per_email),
+        create_rate_limiter("ip", settings.login_rate_limit_max_failures_per_ip),
+    )
+
+
+async def check_login_failures(email: str, client_ip: str) -> Tuple[int, bool]:
+    """Get the seconds until a login for email/IP may be attempted (0 = now)
+    and whether the email has failures for a successful login to reset.
+    """
+    email_limiter, ip_limiter = get_login_limiters()
+    email_retry_after, email_failed = await email_limiter.check(email.lower())
+    ip_retry_after, _ = await ip_limiter.check(client_ip)
+    return max(email_retry_after, ip_retry_after), email_failed
+
+
+async def record_login_failure(email: str, client_ip: str) -> None:
+    """Count a failed login against both the email and the client IP."""
+    email_limiter, ip_limiter = get_login_limiters()
+    await email_limiter.hit(email.lower())
+    await ip_limiter.hit(client_ip)
+
+
+async def reset_login_failures(email: str) -> None:
+    """Clear the failures of an email after a successful login.
+
+    Only called when the check before the login saw failures, so the usual
+    login costs no write; a failure recorded in between expires on its own.
+    """
+    email_limiter, _ = get_login_limiters()
+    await email_limiter.reset(email.lower())
@@ -0,0 +1,186 @@
+"""Pre-built statements of the hot queries.
+
+Each statement is built once, with ``bindparam()`` placeholders, and run
+with a parameter dict. SQLAlchemy memoizes the cache key of a statement
+object, so a request neither rebuilds the construct nor re-walks it to find
+the compiled SQL. Statements whose shape depends on the request (pages)
+are built once per shape.
+
+Writes are single statements whose rowcount tells whether the row exists;
+the values written are returned without reading the row back, except where
+the database lacks ``UPDATE ... RETURNING`` (MySQL).
+"""
+
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Integer, bindparam, delete, exists, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select, Update
+
+from app.models import Shop, ShopAccountEntry, ShopAccountTitle, User
+from app.pagination import keyset_after
+from app.schemas import ShopAccountEntryResponse
+
+_shops = Shop.__table__
+_entries = ShopAccountEntry.__table__
+
+# Page order of a shop's entries (index uq_shop_account_entries_shop_period)
+ENTRY_ORDER = [
+    _entries.c.year,
+    _entries.c.month,
+    _entries.c.shop_account_title_id,
+    _entries.c.id,
+]
+
+# Columns of a listed entry, in ShopAccountEntryResponse field order
+ENTRY_COLUMNS = [_entries.c[name] for name in ShopAccountEntryResponse.model_fields]
+
+# Parameters: email
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+
+# Parameters: shop_id
+SHOP_EXISTS = select(exists().where(Shop.id == bindparam("shop_id")))
+
+# Parameters: shop_id
+SHOP_ROW = select(*_shops.c).where(_shops.c.id == bindparam("shop_id"))
+
+# Parameters: shop_id. Deletes nothing while the shop has account titles
+# or entries; entries have no foreign key to stop it (partitioned table)
+DELETE_SHOP = delete(_shops).where(
+    _shops.c.id == bindparam("shop_id"),
+    ~exists().where(ShopAccountTitle.shop_id == bindparam("shop_id")),
+    ~exists().where(_entries.c.shop_id == bindparam("shop_id")),
+)
+
+# Statements of a single entry filter on id and shop_id only: the API does
+# not know the entry's year, so MySQL checks every partition (no pruning)
+
+# Parameters: shop_id, entry_id
+ENTRY_OF_SHOP = select(ShopAccountEntry).where(
+    ShopAccountEntry.id == bindparam("entry_id"),
+    ShopAccountEntry.shop_id == bindparam("shop_id"),
+)
+
+# Parameters: shop_id, entry_id
+ENTRY_ROW_OF_SHOP = select(*ENTRY_COLUMNS).where(
+    _entries.c.id == bindparam("entry_id"),
+    _entries.c.shop_id == bindparam("shop_id"),
+)
+
+# Parameters: shop_id, entry_id. Whether the shop exists, and the entry in it
+SHOP_AND_ENTRY_EXIST = select(
+    exists().where(Shop.id == bindparam("shop_id")),
+    exists().where(
+        _entries.c.id == bindparam("entry_id"),
+        _entries.c.shop_id == bindparam("shop_id"),
+    ),
+)
+
+# Parameters: shop_id, entry_id
+DELETE_ENTRY_OF_SHOP = delete(_entries).where(
+    _entries.c.id == bindparam("entry_id"),
+    _entries.c.shop_id == bindparam("shop_id"),
+)
+
+
+def db_now() -> datetime:
+    """Get the current time as DATETIME columns store it (UTC, whole seconds).
+
+    Writes set timestamps with it, so they can be returned without a read.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+async def update_returning(
+    db: AsyncSession, stmt: Update, row_stmt: Select, params: Dict[str, Any]
+) -> Optional[Row]:
+    """Run an UPDATE and get the updated row (``row_stmt``'s columns).
+
+    Uses ``RETURNING`` where the database supports it; otherwise the row is
+    selected with ``row_stmt`` and ``params`` in the same transaction, and
+    only if the UPDATE matched one. None when it matched no row.
+    """
+    if db.get_bind().dialect.update_returning:
+        result = await db.execute(stmt.returning(*row_stmt.selected_columns))
+        return result.first()
+    if (await db.execute(stmt)).rowcount == 0:
+        return None
+    return (await db.execute(row_stmt, params)).first()
+
+
+def _after_params(after: List[int]) -> Dict[str, int]:
+    return {f"after_{i}": value for i, value in enumerate(after)}
+
+
+def _after_bindparams(size: int) -> List[Any]:
+    return [bindparam(f"after_{i}") for i in range(size)]
+
+
+@lru_cache(maxsize=None)
+def _shop_page_stmt(keyset: bool, offset: bool) -> Select:
+    stmt = select(Shop)
+    if keyset:
+        stmt = stmt.where(keyset_after([Shop.id], _after_bindparams(1)))
+    elif offset:
+        stmt = stmt.offset(bindparam("offset", type_=Integer))
+    return stmt.order_by(Shop.id).limit(bindparam("limit", type_=Integer))
+
+
+def shop_page(
+    limit: int,
+    offset: int,
+    after: Optional[List[int]],
+) -> Tuple[Select, Dict[str, Any]]:
+    """Get a page of shops ordered by id, after the ``after`` sort key."""
+    stmt = _shop_page_stmt(after is not None, bool(offset))
+    params = {"limit": limit, "offset": offset, **_after_params(after or [])}
+    return stmt, params
+
+
+@lru_cache(maxsize=None)
+def _entry_page_stmt(
+    keyset: bool, offset: bool, year_from: bool, year_to: bool
+) -> Select:
+    # Core columns only: rows are plain tuples, without ORM loading
+    stmt = select(*ENTRY_COLUMNS).where(_entries.c.shop_id == bindparam("shop_id"))
+    if year_from:
+        stmt = stmt.where(_entries.c.year >= bindparam("year_from"))
+    if year_to:
+        stmt = stmt.where(_entries.c.year <= bindparam("year_to"))
+    if keyset:
+        stmt = stmt.where(
+            keyset_after(ENTRY_ORDER, _after_bindparams(len(ENTRY_ORDER)))
+        )
+    elif offset:
+        stmt = stmt.offset(bindparam("offset", type_=Integer))
+    return stmt.order_by(*ENTRY_ORDER).limit(bindparam("limit", type_=Integer))
+
+
+def entry_page(
+    shop_id: int,
+    limit: int,
+    offset: int,
+    after: Optional[List[int]],
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+) -> Tuple[Select, Dict[str, Any]]:
+    """Get a page of a shop's entries (``ENTRY_COLUMNS``) in ``ENTRY_ORDER``.
+
+    ``year_from`` and ``year_to`` limit it to those years, which lets MySQL
+    read only their partitions.
+    """
+    stmt = _entry_page_stmt(
+        after is not None, bool(offset), year_from is not None, year_to is not None
+    )
+    params = {
+        "shop_id": shop_id,
+        "limit": limit,
+        "offset": offset,
+        "year_from": year_from,
+        "year_to": year_to,
+        **_after_params(after or []),
+    }
+    return stmt, params
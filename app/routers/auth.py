@@ -1,21 +1,52 @@
 """Authentication router for login and registration."""
 
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth import (
     authenticate_user,
     create_access_token,
+    create_refresh_token,
+    create_session_id,
+    decode_refresh_token,
+    get_current_admin,
+    get_current_principal,
     get_current_user,
     get_password_hash,
+    get_password_hashes,
+    security,
 )
 from app.config import get_settings
-from app.database import get_db
-from app.dynamodb import delete_token, store_token
+from app.database import get_async_db
 from app.models import User
-from app.schemas import LoginRequest, TokenResponse, UserCreate, UserResponse
+from app.provisioning import provision_users
+from app.rate_limit import (
+    check_login_failures,
+    record_login_failure,
+    reset_login_failures,
+)
+from app.schemas import (
+    BulkUserCreate,
+    BulkUserResponse,
+    LoginRequest,
+    Principal,
+    RefreshRequest,
+    TokenResponse,
+    UserCreate,
+    UserResponse,
+)
+from app.token_cache import token_cache
+from app.token_store import (
+    TokenStoreError,
+    delete_all_tokens,
+    delete_token,
+    rotate_token,
+    store_token,
+)
 
 settings = get_settings()
 
@@ -27,75 +58,216 @@ router = APIRouter(prefix="/auth", tags=["auth"])
     response_model=UserResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user."""
-    # Check if username already exists
-    existing_user = db.query(User).filter(User.name == user_data.name).first()
-    if existing_user:
+    # Let the unique indexes reject duplicates: no pre-check SELECTs and no
+    # race between checking and inserting
+    hashed_password = await get_password_hash(user_data.password)
+    # Set timestamps here so the response needs no refresh SELECT
+    # (DATETIME stores whole seconds)
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    user = User(
+        name=user_data.name,
+        email=user_data.email,
+        hashed_password=hashed_password,
+        created_at=now,
+        updated_at=now,
+    )
+    db.add(user)
+    try:
+        await db.flush()
+        response = UserResponse.model_validate(user)
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already registered",
+            detail=_duplicate_user_detail(e),
         )
+    return response
+
 
-    # Check if email already exists
-    existing_email = db.query(User).filter(User.email == user_data.email).first()
-    if existing_email:
+def _duplicate_user_detail(error: IntegrityError) -> str:
+    # MySQL names the violated index (ix_users_name), SQLite the column
+    message = str(error.orig)
+    if "ix_users_name" in message or "users.name" in message:
+        return "Username already registered"
+    return "Email already registered"
+
+
+@router.post("/register/bulk", response_model=BulkUserResponse)
+async def register_bulk(
+    bulk_data: BulkUserCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin),
+):
+    """Register many users at once (admin only), with a result per row."""
+    if len(bulk_data.users) > settings.bulk_register_max_users:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
+            detail=(
+                f"At most {settings.bulk_register_max_users} users per request;"
+                " use the provision_users command for larger imports"
+            ),
         )
 
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
-    user = User(
-        name=user_data.name,
-        email=user_data.email,
-        hashed_password=hashed_password,
+    try:
+        results = await provision_users(
+            db,
+            bulk_data.users,
+            get_password_hashes,
+            settings.bulk_register_batch_size,
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Users were registered concurrently, please retry",
+        )
+    return BulkUserResponse(
+        created=sum(result.created for result in results),
+        results=results,
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(
+    login_data: LoginRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
     """Login and get access token."""
-    user = authenticate_user(db, login_data.email, login_data.password)
+    # Throttle repeated failures before spending an Argon2 hash on them
+    client_ip = request.client.host if request.client else ""
+    retry_after, email_failed = await check_login_failures(login_data.email, client_ip)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    user = await authenticate_user(db, login_data.email, login_data.password)
     if not user:
+        await record_login_failure(login_data.email, client_ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Create access token
+    if email_failed:
+        await reset_login_failures(login_data.email)
+
+    # Create tokens for a new session (device)
+    session_id = create_session_id()
     access_token_expires = timedelta(minutes=settings.jwt_access_token_expire_minutes)
     access_token = create_access_token(
         sub=str(user.id),
         user_name=user.name,
+        session_id=session_id,
         expires_delta=access_token_expires,
     )
+    refresh_token = create_refresh_token(str(user.id), user.name, session_id)
 
-    # Store token in DynamoDB
-    expire_seconds = settings.jwt_access_token_expire_minutes * 60
-    if not store_token(user.id, access_token, expire_seconds):
+    # Store tokens in the token store; the session lives as long as the
+    # refresh token, the access token still expires on its JWT exp
+    expire_seconds = settings.jwt_refresh_token_expire_minutes * 60
+    if not await store_token(
+        user.id, session_id, access_token, expire_seconds, refresh_token
+    ):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to store token",
         )
 
-    return TokenResponse(access_token=access_token, token_type="bearer")
+    return TokenResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_type="bearer",
+    )
+
+
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh(refresh_data: RefreshRequest):
+    """Exchange a refresh token for new access and refresh tokens."""
+    token_data = decode_refresh_token(refresh_data.refresh_token)
+    if token_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    user_id = token_data.user_id
+    session_id = token_data.session_id
+    access_token = create_access_token(
+        sub=str(user_id),
+        user_name=token_data.user_name,
+        session_id=session_id,
+    )
+    refresh_token = create_refresh_token(str(user_id), token_data.user_name, session_id)
+
+    expire_seconds = settings.jwt_refresh_token_expire_minutes * 60
+    try:
+        rotated = await rotate_token(
+            user_id,
+            session_id,
+            refresh_data.refresh_token,
+            access_token,
+            refresh_token,
+            expire_seconds,
+        )
+    except TokenStoreError as e:
+        # Not a reuse: keep the session, the client retries with the same token
+        print(e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Token store unavailable, please retry",
+            headers={"Retry-After": "1"},
+        )
+    if not rotated:
+        # A used or revoked refresh token: treat it as stolen and end the session
+        await delete_token(user_id, session_id)
+        token_cache.invalidate_session(user_id, session_id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    # The session's previous access token is no longer the stored one
+    token_cache.invalidate_session(user_id, session_id)
+
+    return TokenResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_type="bearer",
+    )
 
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
-def logout(current_user: User = Depends(get_current_user)):
-    """Logout and invalidate token."""
-    delete_token(current_user.id)
+async def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Logout this device and invalidate its token."""
+    await delete_token(current_user.id, current_user.session_id)
+    token_cache.invalidate(credentials.credentials)
+    return None
+
+
+@router.post("/logout_all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_all(current_user: Principal = Depends(get_current_principal)):
+    """Logout every device of the current user."""
+    if not await delete_all_tokens(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to delete tokens",
+        )
+    token_cache.invalidate_user(current_user.id)
     return None
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: User = Depends(get_current_user)):
     """Get current user information."""
     return current_user
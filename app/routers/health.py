@@ -1,8 +1,14 @@
 """Health check router."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.schemas import HealthResponse
+from app.auth import get_current_admin, hash_executor
+from app.config import get_settings
+from app.database import pool_metrics
+from app.schemas import HealthResponse, MetricsResponse, Principal
+from app.token_cache import token_cache
+
+settings = get_settings()
 
 router = APIRouter(tags=["health"])
 
@@ -11,3 +17,14 @@ router = APIRouter(tags=["health"])
 def health_check():
     """Health check endpoint."""
     return HealthResponse(status="ok")
+
+
+@router.get("/health/metrics", response_model=MetricsResponse)
+def metrics(current_user: Principal = Depends(get_current_admin)):
+    """In-process metrics of this container (admin only)."""
+    return MetricsResponse(
+        token_cache=token_cache.stats(),
+        password_hash=hash_executor.stats(),
+        database_pool_profile=settings.db_pool_profile,
+        database_pool={name: m.stats() for name, m in pool_metrics.items()},
+    )
@@ -1,42 +1,62 @@
 """Shop router for CRUD operations."""
 
-from typing import List
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import get_current_principal
+from app.database import get_async_db
+from app.models import Shop
+from app.pagination import get_page_after, set_next_cursor
+from app.repository import (
+    DELETE_SHOP,
+    SHOP_EXISTS,
+    SHOP_ROW,
+    db_now,
+    shop_page,
+    update_returning,
+)
+from app.schemas import Principal, ShopCreate, ShopResponse, ShopUpdate
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+router = APIRouter(prefix="/shop", tags=["shop"])
 
-from app.auth import get_current_user
-from app.database import get_db
-from app.models import Shop, User
-from app.schemas import ShopCreate, ShopResponse, ShopUpdate
 
-router = APIRouter(prefix="/shop", tags=["shop"])
+def _shop_not_found() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Shop not found")
 
 
 @router.get("", response_model=List[ShopResponse])
-def get_shops(
+async def get_shops(
+    response: Response,
     limit: int = 100,
     offset: int = 0,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    """Get all shops with pagination."""
-    shops = db.query(Shop).offset(offset).limit(limit).all()
+    """Get all shops with pagination.
+
+    Pass the ``X-Next-Cursor`` response header as ``cursor`` to get the
+    next page; ``offset`` is kept for existing clients.
+    """
+    stmt, params = shop_page(limit, offset, get_page_after(cursor, offset, 1))
+    shops = (await db.scalars(stmt, params)).all()
+    set_next_cursor(response, shops, limit, lambda shop: [shop.id])
     return shops
 
 
 @router.get("/{shop_id}", response_model=ShopResponse)
-def get_shop(
+async def get_shop(
     shop_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Get a single shop by ID."""
-    shop = db.query(Shop).filter(Shop.id == shop_id).first()
+    shop = await db.get(Shop, shop_id)
     if shop is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Shop not found"
-        )
+        raise _shop_not_found()
     return shop
 
 
@@ -45,54 +65,55 @@ def get_shop(
     response_model=ShopResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def create_shop(
+async def create_shop(
     shop_data: ShopCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Create a new shop."""
-    shop = Shop(**shop_data.model_dump())
-    db.add(shop)
-    db.commit()
-    db.refresh(shop)
-    return shop
+    now = db_now()
+    values = {**shop_data.model_dump(), "created_at": now, "updated_at": now}
+    result = await db.execute(insert(Shop).values(values))
+    await db.commit()
+    return Shop(id=result.lastrowid, **values)
 
 
 @router.put("/{shop_id}", response_model=ShopResponse)
-def update_shop(
+async def update_shop(
     shop_id: int,
     shop_data: ShopUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Update an existing shop."""
-    shop = db.query(Shop).filter(Shop.id == shop_id).first()
+    values = {**shop_data.model_dump(exclude_unset=True), "updated_at": db_now()}
+    stmt = update(Shop.__table__).where(Shop.id == shop_id).values(values)
+    shop = await update_returning(db, stmt, SHOP_ROW, {"shop_id": shop_id})
     if shop is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Shop not found"
-        )
-
-    update_data = shop_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(shop, field, value)
-
-    db.commit()
-    db.refresh(shop)
+        raise _shop_not_found()
+    await db.commit()
     return shop
 
 
 @router.delete("/{shop_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_shop(
+async def delete_shop(
     shop_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    """Delete a shop."""
-    shop = db.query(Shop).filter(Shop.id == shop_id).first()
-    if shop is None:
+    """Delete a shop.
+
+    A shop with account titles or entries is not deleted (409), so its
+    entries are never left without a shop.
+    """
+    params = {"shop_id": shop_id}
+    result = await db.execute(DELETE_SHOP, params)
+    if result.rowcount == 0:
+        if not await db.scalar(SHOP_EXISTS, params):
+            raise _shop_not_found()
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Shop not found"
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Shop has account titles or entries",
         )
-    db.delete(shop)
-    db.commit()
+    await db.commit()
     return None
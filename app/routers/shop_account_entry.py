@@ -1,14 +1,30 @@
 """ShopAccountEntry router for CRUD operations."""
 
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import exists, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth import get_current_user
-from app.database import get_db
-from app.models import Shop, ShopAccountEntry, User
+from app.auth import get_current_principal
+from app.database import get_async_db
+from app.json_rows import RowEncoder
+from app.models import ShopAccountEntry, ShopAccountTitle
+from app.pagination import get_page_after, set_next_cursor
+from app.repository import (
+    DELETE_ENTRY_OF_SHOP,
+    ENTRY_OF_SHOP,
+    ENTRY_ORDER,
+    ENTRY_ROW_OF_SHOP,
+    SHOP_AND_ENTRY_EXIST,
+    SHOP_EXISTS,
+    db_now,
+    entry_page,
+    update_returning,
+)
 from app.schemas import (
+    Principal,
     ShopAccountEntryCreate,
     ShopAccountEntryResponse,
     ShopAccountEntryUpdate,
@@ -19,58 +35,123 @@ router = APIRouter(
     tags=["shop_account_entry"],
 )
 
+# Rows of repository.ENTRY_COLUMNS to ShopAccountEntryResponse JSON
+entry_encoder = RowEncoder(ShopAccountEntryResponse)
+
+
+def _shop_not_found() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Shop not found")
+
+
+def _data_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="ShopAccountEntry not found",
+    )
+
+
+def _title_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="ShopAccountTitle not found",
+    )
+
+
+def _duplicate_period() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="ShopAccountEntry already registered for this period and title",
+    )
+
+
+def _is_duplicate_period(error: IntegrityError) -> bool:
+    # MySQL names the violated index, SQLite the table's columns
+    message = str(error.orig)
+    return (
+        "uq_shop_account_entries_shop_period" in message
+        or "UNIQUE constraint failed: shop_account_entries." in message
+    )
+
+
+async def _shop_exists(db: AsyncSession, shop_id: int) -> bool:
+    return await db.scalar(SHOP_EXISTS, {"shop_id": shop_id})
+
+
+def _title_of_shop(shop_id: int, title_id: int):
+    # The table is partitioned, so there are no foreign keys to check this
+    return exists().where(
+        ShopAccountTitle.id == title_id,
+        ShopAccountTitle.shop_id == shop_id,
+    )
+
+
+async def _get_data(db: AsyncSession, shop_id: int, data_id: int) -> ShopAccountEntry:
+    """Get an entry of a shop, telling a missing shop from a missing entry.
+
+    The shop is only looked up when the entry is not found.
+    """
+    data = await db.scalar(ENTRY_OF_SHOP, {"shop_id": shop_id, "entry_id": data_id})
+    if data is None:
+        if not await _shop_exists(db, shop_id):
+            raise _shop_not_found()
+        raise _data_not_found()
+    return data
+
 
 @router.get("", response_model=List[ShopAccountEntryResponse])
-def get_shop_account_entry_list(
+async def get_shop_account_entry_list(
     shop_id: int,
     limit: int = 100,
     offset: int = 0,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    """Get all data for a shop with pagination."""
-    shop = db.query(Shop).filter(Shop.id == shop_id).first()
-    if shop is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Shop not found"
-        )
-    data = (
-        db.query(ShopAccountEntry)
-        .filter(ShopAccountEntry.shop_id == shop_id)
-        .offset(offset)
-        .limit(limit)
-        .all()
+    """Get all data for a shop with pagination.
+
+    Pages are ordered by year, month, account title and id. Pass the
+    ``X-Next-Cursor`` response header as ``cursor`` to get the next page;
+    ``offset`` is kept for existing clients. ``year_from`` and ``year_to``
+    limit the data to those years.
+
+    Rows are encoded to JSON directly, without ORM objects or a response
+    model per row; ``response_model`` still documents the shape.
+    """
+    stmt, params = entry_page(
+        shop_id,
+        limit,
+        offset,
+        get_page_after(cursor, offset, len(ENTRY_ORDER)),
+        year_from,
+        year_to,
     )
-    return data
+    rows = (await db.execute(stmt, params)).all()
+    # An empty page is either a shop without data or a missing shop
+    if not rows and not await _shop_exists(db, shop_id):
+        raise _shop_not_found()
+    response = Response(
+        content=entry_encoder.encode(rows), media_type="application/json"
+    )
+    set_next_cursor(
+        response,
+        rows,
+        limit,
+        lambda row: [row.year, row.month, row.shop_account_title_id, row.id],
+    )
+    return response
 
 
 @router.get("/{data_id}", response_model=ShopAccountEntryResponse)
-def get_shop_account_entry(
+async def get_shop_account_entry(
     shop_id: int,
     data_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Get a single data by ID for a shop."""
-    shop = db.query(Shop).filter(Shop.id == shop_id).first()
-    if shop is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Shop not found"
-        )
-    data = (
-        db.query(ShopAccountEntry)
-        .filter(
-            ShopAccountEntry.id == data_id,
-            ShopAccountEntry.shop_id == shop_id,
-        )
-        .first()
-    )
-    if data is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="ShopAccountEntry not found",
-        )
-    return data
+    return await _get_data(db, shop_id, data_id)
 
 
 @router.post(
@@ -78,91 +159,105 @@ def get_shop_account_entry(
     response_model=ShopAccountEntryResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def create_shop_account_entry(
+async def create_shop_account_entry(
     shop_id: int,
     data_data: ShopAccountEntryCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Create a new data for a shop."""
-    shop = db.query(Shop).filter(Shop.id == shop_id).first()
-    if shop is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Shop not found"
-        )
-    data = ShopAccountEntry(
-        shop_id=shop_id,
-        **data_data.model_dump(),
+    now = db_now()
+    values = {
+        **data_data.model_dump(exclude={"shop_id"}),
+        "shop_id": shop_id,
+        "created_at": now,
+        "updated_at": now,
+    }
+    columns = ShopAccountEntry.__table__.c
+    # INSERT ... SELECT ... WHERE EXISTS: inserts nothing unless the title
+    # belongs to the shop, without a separate existence query
+    stmt = insert(ShopAccountEntry).from_select(
+        list(values),
+        select(
+            *(literal(value, columns[key].type) for key, value in values.items())
+        ).where(_title_of_shop(shop_id, data_data.shop_account_title_id)),
     )
-    db.add(data)
-    db.commit()
-    db.refresh(data)
-    return data
+    try:
+        result = await db.execute(stmt)
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if _is_duplicate_period(e):
+            raise _duplicate_period()
+        raise
+    if result.rowcount == 0:
+        if not await _shop_exists(db, shop_id):
+            raise _shop_not_found()
+        raise _title_not_found()
+    return ShopAccountEntry(id=result.lastrowid, **values)
 
 
 @router.put("/{data_id}", response_model=ShopAccountEntryResponse)
-def update_shop_account_entry(
+async def update_shop_account_entry(
     shop_id: int,
     data_id: int,
     data_data: ShopAccountEntryUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    """Update an existing data for a shop."""
-    shop = db.query(Shop).filter(Shop.id == shop_id).first()
-    if shop is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Shop not found"
-        )
-    data = (
-        db.query(ShopAccountEntry)
-        .filter(
-            ShopAccountEntry.id == data_id,
-            ShopAccountEntry.shop_id == shop_id,
-        )
-        .first()
-    )
-    if data is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="ShopAccountEntry not found",
-        )
-
-    update_data = data_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(data, field, value)
+    """Update an existing data for a shop.
 
-    db.commit()
-    db.refresh(data)
+    The ``id`` of the body is ignored; the entry is the one of the path.
+    """
+    values = {
+        **data_data.model_dump(exclude_unset=True, exclude={"id"}),
+        "updated_at": db_now(),
+    }
+    columns = ShopAccountEntry.__table__.c
+    stmt = (
+        update(ShopAccountEntry.__table__)
+        .where(columns.id == data_id, columns.shop_id == shop_id)
+        .values(values)
+    )
+    title_id = values.get("shop_account_title_id")
+    if title_id is not None:
+        # Updates nothing unless the title belongs to the shop
+        stmt = stmt.where(_title_of_shop(shop_id, title_id))
+    params = {"shop_id": shop_id, "entry_id": data_id}
+    try:
+        data = await update_returning(db, stmt, ENTRY_ROW_OF_SHOP, params)
+        if data is None:
+            # Tell a missing shop or entry from a title of another shop
+            shop_exists, entry_exists = (
+                await db.execute(SHOP_AND_ENTRY_EXIST, params)
+            ).one()
+            if not shop_exists:
+                raise _shop_not_found()
+            if not entry_exists:
+                raise _data_not_found()
+            raise _title_not_found()
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if _is_duplicate_period(e):
+            raise _duplicate_period()
+        raise
     return data
 
 
 @router.delete("/{data_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_shop_account_entry(
+async def delete_shop_account_entry(
     shop_id: int,
     data_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Delete a data for a shop."""
-    shop = db.query(Shop).filter(Shop.id == shop_id).first()
-    if shop is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Shop not found"
-        )
-    data = (
-        db.query(ShopAccountEntry)
-        .filter(
-            ShopAccountEntry.id == data_id,
-            ShopAccountEntry.shop_id == shop_id,
-        )
-        .first()
-    )
-    if data is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="ShopAccountEntry not found",
-        )
-    db.delete(data)
-    db.commit()
+    params = {"shop_id": shop_id, "entry_id": data_id}
+    result = await db.execute(DELETE_ENTRY_OF_SHOP, params)
+    if result.rowcount == 0:
+        if not await _shop_exists(db, shop_id):
+            raise _shop_not_found()
+        raise _data_not_found()
+    await db.commit()
     return None
@@ -1,14 +1,19 @@
 """Schemas package."""
 
 from app.schemas.auth import (
+    BulkUserCreate,
+    BulkUserResponse,
+    BulkUserResult,
     LoginRequest,
+    Principal,
+    RefreshRequest,
     TokenData,
     TokenResponse,
     UserBase,
     UserCreate,
     UserResponse,
 )
-from app.schemas.health import HealthResponse
+from app.schemas.health import HealthResponse, MetricsResponse
 from app.schemas.shop import (
     ShopCreate,
     ShopResponse,
@@ -28,7 +33,13 @@ __all__ = [
     "ShopAccountDataUpdate",
     "ShopAccountDataResponse",
     "HealthResponse",
+    "MetricsResponse",
+    "BulkUserCreate",
+    "BulkUserResponse",
+    "BulkUserResult",
     "LoginRequest",
+    "Principal",
+    "RefreshRequest",
     "TokenData",
     "TokenResponse",
     "UserBase",
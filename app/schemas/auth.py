@@ -1,7 +1,7 @@
 """Pydantic schemas for authentication request/response validation."""
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
@@ -29,6 +29,30 @@ class UserResponse(UserBase):
     updated_at: datetime
 
 
+class BulkUserCreate(BaseModel):
+    """Schema for creating Users in bulk."""
+
+    users: List[UserCreate] = Field(..., min_length=1)
+
+
+class BulkUserResult(BaseModel):
+    """Schema for the result of one row of a bulk create."""
+
+    index: int
+    name: str
+    email: str
+    id: Optional[int] = None
+    created: bool
+    detail: Optional[str] = None
+
+
+class BulkUserResponse(BaseModel):
+    """Schema for bulk create response."""
+
+    created: int
+    results: List[BulkUserResult]
+
+
 class LoginRequest(BaseModel):
     """Schema for login request."""
 
@@ -40,11 +64,28 @@ class TokenResponse(BaseModel):
     """Schema for token response."""
 
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
 
 
+class RefreshRequest(BaseModel):
+    """Schema for refresh request."""
+
+    refresh_token: str
+
+
 class TokenData(BaseModel):
     """Schema for decoded token data."""
 
     user_id: Optional[int] = None
     user_name: Optional[str] = None
+    session_id: str = ""
+    exp: Optional[int] = None
+
+
+class Principal(BaseModel):
+    """Schema for the authenticated identity of a request."""
+
+    id: int
+    name: Optional[str] = None
+    session_id: str = ""
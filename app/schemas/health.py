@@ -1,6 +1,6 @@
 """Health check schemas."""
 
-from typing import Literal
+from typing import Dict, Literal, Union
 
 from pydantic import BaseModel
 
@@ -9,3 +9,12 @@ class HealthResponse(BaseModel):
     """Health check response schema."""
 
     status: Literal["ok"]
+
+
+class MetricsResponse(BaseModel):
+    """In-process metrics response schema."""
+
+    token_cache: Dict[str, int]
+    password_hash: Dict[str, Union[int, float]]
+    database_pool_profile: str
+    database_pool: Dict[str, Dict[str, Union[int, float]]]
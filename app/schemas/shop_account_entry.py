@@ -1,9 +1,18 @@
 """Pydantic schemas for shop request/response validation."""
 
 from datetime import datetime
-from typing import Optional
+from decimal import Decimal
+from typing import Annotated, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field
+
+# DECIMAL(12, 2) kept as Decimal end to end and serialized as an exact
+# string ("10.50"); scaled like the column so an echo matches a later read
+Amount = Annotated[
+    Decimal,
+    Field(max_digits=12, decimal_places=2),
+    AfterValidator(lambda value: value.quantize(Decimal("0.01"))),
+]
 
 
 class ShopAccountEntryBase(BaseModel):
@@ -13,7 +22,7 @@ class ShopAccountEntryBase(BaseModel):
     shop_account_title_id: int
     year: int
     month: int
-    amount: float
+    amount: Amount
 
 
 class ShopAccountEntryCreate(ShopAccountEntryBase):
@@ -29,7 +38,7 @@ class ShopAccountEntryUpdate(BaseModel):
     shop_account_title_id: Optional[int] = None
     year: Optional[int] = None
     month: Optional[int] = None
-    amount: Optional[float] = None
+    amount: Optional[Amount] = None
 
 
 class ShopAccountEntryResponse(ShopAccountEntryBase):
@@ -42,6 +51,6 @@ class ShopAccountEntryResponse(ShopAccountEntryBase):
     shop_account_title_id: int
     year: int
     month: int
-    amount: float
+    amount: Amount
     created_at: datetime
     updated_at: datetime
@@ -0,0 +1,113 @@
+"""In-process cache of validated access tokens."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import get_settings
+from app.token_store.base import token_digest
+
+settings = get_settings()
+
+
+class TokenCache:
+    """Bounded TTL cache of token digest -> validated user identity.
+
+    Lives for the lifetime of the (warm) Lambda container. Entries expire
+    on the JWT ``exp`` or after ``ttl_seconds``, whichever comes first, so a
+    token revoked by another container stops working within the TTL.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        # digest -> (expires_at, user_id, session_id, identity)
+        self._entries: "OrderedDict[bytes, Tuple[float, int, str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[Any]:
+        """Get the cached identity for a token, or None."""
+        key = token_digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, _, _, identity = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return identity
+
+    def set(
+        self,
+        token: str,
+        user_id: int,
+        identity: Any,
+        token_exp: Optional[int] = None,
+        session_id: str = "",
+    ) -> None:
+        """Cache the identity for a token."""
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        key = token_digest(token)
+        with self._lock:
+            self._entries[key] = (expires_at, user_id, session_id, identity)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str) -> None:
+        """Evict a single token."""
+        with self._lock:
+            self._entries.pop(token_digest(token), None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Evict every token cached for a user."""
+        with self._lock:
+            keys = [k for k, v in self._entries.items() if v[1] == user_id]
+            for key in keys:
+                del self._entries[key]
+
+    def invalidate_session(self, user_id: int, session_id: str) -> None:
+        """Evict every token cached for one session (device) of a user."""
+        with self._lock:
+            keys = [
+                k
+                for k, v in self._entries.items()
+                if v[1] == user_id and v[2] == session_id
+            ]
+            for key in keys:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Evict all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+token_cache = TokenCache(
+    max_size=settings.token_cache_max_size,
+    ttl_seconds=settings.token_cache_ttl_seconds,
+)
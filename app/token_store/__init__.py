@@ -0,0 +1,105 @@
+"""Token store package."""
+
+from functools import lru_cache
+from typing import Optional
+
+from app.config import get_settings
+from app.token_store.base import TokenStore, TokenStoreError, token_digest
+
+settings = get_settings()
+
+
+@lru_cache()
+def get_token_store() -> TokenStore:
+    """Get the token store selected by ``token_store_backend`` (singleton)."""
+    return create_token_store(settings.token_store_backend)
+
+
+def create_token_store(backend: str) -> TokenStore:
+    """Create a token store for the given backend name."""
+    if backend == "dynamodb":
+        from app.token_store.dynamodb import DynamoDBTokenStore
+
+        return DynamoDBTokenStore(settings.dynamodb_table_name)
+    if backend == "memory":
+        from app.token_store.memory import MemoryTokenStore
+
+        return MemoryTokenStore(settings.token_store_memory_max_size)
+    if backend == "mysql":
+        from app.database import async_engine
+        from app.token_store.mysql import MySQLTokenStore
+
+        return MySQLTokenStore(
+            async_engine,
+            accept_legacy=settings.token_store_accept_legacy,
+        )
+    if backend == "sqlite":
+        from app.token_store.sqlite import SQLiteTokenStore
+
+        return SQLiteTokenStore(settings.token_store_sqlite_path)
+    raise ValueError(f"Unknown token store backend: {backend}")
+
+
+async def store_token(
+    user_id: int,
+    session_id: str,
+    token: str,
+    expire_seconds: int,
+    refresh_token: Optional[str] = None,
+) -> bool:
+    """Store tokens for a session with expiration."""
+    return await get_token_store().store(
+        user_id, session_id, token, expire_seconds, refresh_token
+    )
+
+
+async def rotate_token(
+    user_id: int,
+    session_id: str,
+    refresh_token: str,
+    token: str,
+    new_refresh_token: str,
+    expire_seconds: int,
+) -> bool:
+    """Replace a session's tokens if the refresh token is still current.
+
+    Raises TokenStoreError when the store fails.
+    """
+    return await get_token_store().rotate(
+        user_id, session_id, refresh_token, token, new_refresh_token, expire_seconds
+    )
+
+
+async def get_stored_token_digest(user_id: int, session_id: str) -> Optional[bytes]:
+    """Get the digest of the stored token for a session."""
+    return await get_token_store().get_digest(user_id, session_id)
+
+
+async def delete_token(user_id: int, session_id: str) -> bool:
+    """Delete token for a session."""
+    return await get_token_store().delete(user_id, session_id)
+
+
+async def delete_all_tokens(user_id: int) -> bool:
+    """Delete tokens of every session of a user."""
+    return await get_token_store().delete_all(user_id)
+
+
+async def is_token_valid(user_id: int, session_id: str, token: str) -> bool:
+    """Check if the provided token matches the stored token of its session."""
+    return await get_token_store().is_valid(user_id, session_id, token)
+
+
+__all__ = [
+    "TokenStore",
+    "TokenStoreError",
+    "token_digest",
+    "create_token_store",
+    "get_token_store",
+    "store_token",
+    "rotate_token",
+    "get_stored_token_digest",
+    "delete_token",
+    "delete_all_tokens",
+    "is_token_valid",
+]
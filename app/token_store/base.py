@@ -0,0 +1,81 @@
+"""Token store interface."""
+
+import hashlib
+import hmac
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+
+class TokenStoreError(Exception):
+    """Raised when the store cannot be reached to answer a request."""
+
+
+def token_digest(token: str) -> bytes:
+    """Get the fixed 32-byte digest stored in place of a token."""
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+class TokenStore(ABC):
+    """Storage of the currently valid access token per user session.
+
+    Each login creates a session keyed by ``(user_id, session_id)``, so a
+    user can stay logged in on several devices. A session holds its current
+    access token and, optionally, its current refresh token. Stores keep
+    SHA-256 digests rather than the tokens themselves, so items stay the
+    same size whatever claims the JWT carries.
+    """
+
+    @abstractmethod
+    async def store(
+        self,
+        user_id: int,
+        session_id: str,
+        token: str,
+        expire_seconds: int,
+        refresh_token: Optional[str] = None,
+    ) -> bool:
+        """Store tokens for a session with expiration."""
+
+    @abstractmethod
+    async def rotate(
+        self,
+        user_id: int,
+        session_id: str,
+        refresh_token: str,
+        token: str,
+        new_refresh_token: str,
+        expire_seconds: int,
+    ) -> bool:
+        """Replace a session's tokens if ``refresh_token`` is its current one.
+
+        This is a single conditional write, so each refresh token can be
+        used once; a token that was already rotated is rejected (False).
+        Raises :class:`TokenStoreError` when the backend fails, so a failed
+        write is not taken for a reused token.
+        """
+
+    @abstractmethod
+    async def get_digest(self, user_id: int, session_id: str) -> Optional[bytes]:
+        """Get the digest of the stored, unexpired token for a session."""
+
+    @abstractmethod
+    async def delete(self, user_id: int, session_id: str) -> bool:
+        """Delete a single session (logout this device)."""
+
+    @abstractmethod
+    async def delete_all(self, user_id: int) -> bool:
+        """Delete every session of a user (logout all devices)."""
+
+    async def is_valid(self, user_id: int, session_id: str, token: str) -> bool:
+        """Check in constant time if the token matches the stored one."""
+        stored_digest = await self.get_digest(user_id, session_id)
+        if stored_digest is None:
+            return False
+        return hmac.compare_digest(stored_digest, token_digest(token))
+
+    def stats(self) -> Dict[str, float]:
+        """Get backend specific counters."""
+        return {}
+
+    async def close(self) -> None:
+        """Release resources held by the store."""
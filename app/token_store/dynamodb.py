@@ -0,0 +1,209 @@
+"""DynamoDB token store."""
+
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from app.dynamodb import get_dynamodb_client
+from app.token_store.base import TokenStore, TokenStoreError, token_digest
+
+# BatchWriteItem accepts at most 25 requests per call
+BATCH_WRITE_MAX_ITEMS = 25
+BATCH_WRITE_MAX_ATTEMPTS = 5
+
+
+class DynamoDBTokenStore(TokenStore):
+    """Token store backed by a DynamoDB table.
+
+    The table has partition key ``user_id`` and sort key ``session_id``.
+    Items hold the access and refresh token digests in the binary
+    ``token_digest`` and ``refresh_digest`` attributes.
+    """
+
+    def __init__(self, table_name: str):
+        self.table_name = table_name
+        self._lock = threading.Lock()
+        self._read_units = 0.0
+        self._write_units = 0.0
+
+    def _record_capacity(self, response: dict, write: bool) -> None:
+        consumed = response.get("ConsumedCapacity", {})
+        if isinstance(consumed, list):
+            units = sum(c.get("CapacityUnits", 0.0) for c in consumed)
+        else:
+            units = consumed.get("CapacityUnits", 0.0)
+        with self._lock:
+            if write:
+                self._write_units += units
+            else:
+                self._read_units += units
+
+    @staticmethod
+    def _key(user_id: int, session_id: str) -> dict:
+        return {"user_id": {"S": str(user_id)}, "session_id": {"S": session_id}}
+
+    def _item(
+        self,
+        user_id: int,
+        session_id: str,
+        token: str,
+        refresh_token: Optional[str],
+        expire_seconds: int,
+    ) -> dict:
+        item = {
+            **self._key(user_id, session_id),
+            "token_digest": {"B": token_digest(token)},
+            "ttl": {"N": str(int(time.time()) + expire_seconds)},
+        }
+        if refresh_token is not None:
+            item["refresh_digest"] = {"B": token_digest(refresh_token)}
+        return item
+
+    async def store(
+        self,
+        user_id: int,
+        session_id: str,
+        token: str,
+        expire_seconds: int,
+        refresh_token: Optional[str] = None,
+    ) -> bool:
+        client = await get_dynamodb_client()
+        try:
+            response = await client.put_item(
+                TableName=self.table_name,
+                Item=self._item(
+                    user_id, session_id, token, refresh_token, expire_seconds
+                ),
+                ReturnConsumedCapacity="TOTAL",
+            )
+            self._record_capacity(response, write=True)
+            return True
+        except (BotoCoreError, ClientError) as e:
+            print(f"Error storing token: {e}")
+            return False
+
+    async def rotate(
+        self,
+        user_id: int,
+        session_id: str,
+        refresh_token: str,
+        token: str,
+        new_refresh_token: str,
+        expire_seconds: int,
+    ) -> bool:
+        client = await get_dynamodb_client()
+        try:
+            response = await client.put_item(
+                TableName=self.table_name,
+                Item=self._item(
+                    user_id, session_id, token, new_refresh_token, expire_seconds
+                ),
+                ConditionExpression="refresh_digest = :refresh_digest AND #ttl > :now",
+                ExpressionAttributeNames={"#ttl": "ttl"},
+                ExpressionAttributeValues={
+                    ":refresh_digest": {"B": token_digest(refresh_token)},
+                    ":now": {"N": str(int(time.time()))},
+                },
+                ReturnConsumedCapacity="TOTAL",
+            )
+            self._record_capacity(response, write=True)
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return False
+            raise TokenStoreError(f"Error rotating token: {e}") from e
+        except BotoCoreError as e:
+            raise TokenStoreError(f"Error rotating token: {e}") from e
+
+    async def get_digest(self, user_id: int, session_id: str) -> Optional[bytes]:
+        client = await get_dynamodb_client()
+        try:
+            response = await client.get_item(
+                TableName=self.table_name,
+                Key=self._key(user_id, session_id),
+                ReturnConsumedCapacity="TOTAL",
+            )
+            self._record_capacity(response, write=False)
+            item = response.get("Item")
+            if item:
+                # Check if token has expired (in case TTL hasn't cleaned it up yet)
+                ttl = int(item.get("ttl", {}).get("N", 0))
+                if ttl > int(time.time()):
+                    return item["token_digest"]["B"]
+            return None
+        except (BotoCoreError, ClientError) as e:
+            print(f"Error retrieving token: {e}")
+            return None
+
+    async def delete(self, user_id: int, session_id: str) -> bool:
+        client = await get_dynamodb_client()
+        try:
+            response = await client.delete_item(
+                TableName=self.table_name,
+                Key=self._key(user_id, session_id),
+                ReturnConsumedCapacity="TOTAL",
+            )
+            self._record_capacity(response, write=True)
+            return True
+        except (BotoCoreError, ClientError) as e:
+            print(f"Error deleting token: {e}")
+            return False
+
+    async def _list_session_ids(self, user_id: int) -> List[str]:
+        client = await get_dynamodb_client()
+        session_ids = []
+        kwargs = {
+            "TableName": self.table_name,
+            "KeyConditionExpression": "user_id = :user_id",
+            "ExpressionAttributeValues": {":user_id": {"S": str(user_id)}},
+            "ProjectionExpression": "session_id",
+            "ReturnConsumedCapacity": "TOTAL",
+        }
+        while True:
+            response = await client.query(**kwargs)
+            self._record_capacity(response, write=False)
+            session_ids.extend(i["session_id"]["S"] for i in response["Items"])
+            if "LastEvaluatedKey" not in response:
+                return session_ids
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    async def _batch_delete(self, requests: List[dict]) -> None:
+        client = await get_dynamodb_client()
+        for attempt in range(BATCH_WRITE_MAX_ATTEMPTS):
+            response = await client.batch_write_item(
+                RequestItems={self.table_name: requests},
+                ReturnConsumedCapacity="TOTAL",
+            )
+            self._record_capacity(response, write=True)
+            requests = response.get("UnprocessedItems", {}).get(self.table_name)
+            if not requests:
+                return
+            await asyncio.sleep(0.05 * 2**attempt)
+        raise RuntimeError(f"{len(requests)} sessions were left undeleted")
+
+    async def delete_all(self, user_id: int) -> bool:
+        try:
+            requests = [
+                {"DeleteRequest": {"Key": self._key(user_id, session_id)}}
+                for session_id in await self._list_session_ids(user_id)
+            ]
+            await asyncio.gather(
+                *(
+                    self._batch_delete(requests[i : i + BATCH_WRITE_MAX_ITEMS])
+                    for i in range(0, len(requests), BATCH_WRITE_MAX_ITEMS)
+                )
+            )
+            return True
+        except (BotoCoreError, ClientError, RuntimeError) as e:
+            print(f"Error deleting tokens: {e}")
+            return False
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "consumed_read_units": self._read_units,
+                "consumed_write_units": self._write_units,
+            }
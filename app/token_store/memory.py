@@ -0,0 +1,108 @@
+"""In-memory LRU token store for single-node deployments and tests."""
+
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from app.token_store.base import TokenStore, token_digest
+
+# (token digest, refresh token digest, expires at)
+_Entry = Tuple[bytes, Optional[bytes], float]
+
+
+class MemoryTokenStore(TokenStore):
+    """Token store kept in process memory, evicting least recently used."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._digests: "OrderedDict[Tuple[int, str], _Entry]" = OrderedDict()
+        self._sessions: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def _remove(self, key: Tuple[int, str]) -> None:
+        self._digests.pop(key, None)
+        user_id, session_id = key
+        sessions = self._sessions.get(user_id)
+        if sessions is not None:
+            sessions.discard(session_id)
+            if not sessions:
+                del self._sessions[user_id]
+
+    def _put(
+        self,
+        key: Tuple[int, str],
+        token: str,
+        refresh_token: Optional[str],
+        expire_seconds: int,
+    ) -> None:
+        self._digests[key] = (
+            token_digest(token),
+            token_digest(refresh_token) if refresh_token is not None else None,
+            time.time() + expire_seconds,
+        )
+        self._digests.move_to_end(key)
+        self._sessions.setdefault(key[0], set()).add(key[1])
+        while len(self._digests) > self.max_size:
+            self._remove(next(iter(self._digests)))
+
+    async def store(
+        self,
+        user_id: int,
+        session_id: str,
+        token: str,
+        expire_seconds: int,
+        refresh_token: Optional[str] = None,
+    ) -> bool:
+        with self._lock:
+            self._put((user_id, session_id), token, refresh_token, expire_seconds)
+        return True
+
+    async def rotate(
+        self,
+        user_id: int,
+        session_id: str,
+        refresh_token: str,
+        token: str,
+        new_refresh_token: str,
+        expire_seconds: int,
+    ) -> bool:
+        key = (user_id, session_id)
+        with self._lock:
+            entry = self._digests.get(key)
+            if entry is None:
+                return False
+            _, refresh_digest, expires_at = entry
+            if (
+                expires_at <= time.time()
+                or refresh_digest is None
+                or not hmac.compare_digest(refresh_digest, token_digest(refresh_token))
+            ):
+                return False
+            self._put(key, token, new_refresh_token, expire_seconds)
+        return True
+
+    async def get_digest(self, user_id: int, session_id: str) -> Optional[bytes]:
+        key = (user_id, session_id)
+        with self._lock:
+            entry = self._digests.get(key)
+            if entry is None:
+                return None
+            digest, _, expires_at = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                return None
+            self._digests.move_to_end(key)
+            return digest
+
+    async def delete(self, user_id: int, session_id: str) -> bool:
+        with self._lock:
+            self._remove((user_id, session_id))
+        return True
+
+    async def delete_all(self, user_id: int) -> bool:
+        with self._lock:
+            for session_id in list(self._sessions.get(user_id, ())):
+                self._remove((user_id, session_id))
+        return True
@@ -0,0 +1,129 @@
+"""MySQL token store reusing the application's async database engine."""
+
+import time
+from typing import Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.models import UserToken
+from app.token_store.base import TokenStore, TokenStoreError, token_digest
+
+
+class MySQLTokenStore(TokenStore):
+    """Token store backed by the ``user_tokens`` table.
+
+    Runs on the async engine, so token validation does not take a
+    threadpool thread. Rows written before the switch to digests keep the
+    raw JWT in ``token`` and are accepted while ``accept_legacy`` is set.
+    Rows written before sessions have an empty ``session_id``, matching
+    tokens without a ``sid`` claim.
+    """
+
+    def __init__(self, engine: AsyncEngine, accept_legacy: bool = True):
+        self.engine = engine
+        self.accept_legacy = accept_legacy
+
+    async def store(
+        self,
+        user_id: int,
+        session_id: str,
+        token: str,
+        expire_seconds: int,
+        refresh_token: Optional[str] = None,
+    ) -> bool:
+        expires_at = int(time.time()) + expire_seconds
+        stmt = insert(UserToken).values(
+            user_id=user_id,
+            session_id=session_id,
+            token=None,
+            token_digest=token_digest(token),
+            refresh_digest=(
+                token_digest(refresh_token) if refresh_token is not None else None
+            ),
+            expires_at=expires_at,
+        )
+        stmt = stmt.on_duplicate_key_update(
+            token=stmt.inserted.token,
+            token_digest=stmt.inserted.token_digest,
+            refresh_digest=stmt.inserted.refresh_digest,
+            expires_at=stmt.inserted.expires_at,
+        )
+        try:
+            async with self.engine.begin() as conn:
+                await conn.execute(stmt)
+            return True
+        except SQLAlchemyError as e:
+            print(f"Error storing token: {e}")
+            return False
+
+    async def rotate(
+        self,
+        user_id: int,
+        session_id: str,
+        refresh_token: str,
+        token: str,
+        new_refresh_token: str,
+        expire_seconds: int,
+    ) -> bool:
+        now = int(time.time())
+        stmt = (
+            update(UserToken)
+            .where(
+                UserToken.user_id == user_id,
+                UserToken.session_id == session_id,
+                UserToken.refresh_digest == token_digest(refresh_token),
+                UserToken.expires_at > now,
+            )
+            .values(
+                token=None,
+                token_digest=token_digest(token),
+                refresh_digest=token_digest(new_refresh_token),
+                expires_at=now + expire_seconds,
+            )
+        )
+        try:
+            async with self.engine.begin() as conn:
+                return (await conn.execute(stmt)).rowcount == 1
+        except SQLAlchemyError as e:
+            raise TokenStoreError(f"Error rotating token: {e}") from e
+
+    async def get_digest(self, user_id: int, session_id: str) -> Optional[bytes]:
+        stmt = select(UserToken.token_digest, UserToken.token).where(
+            UserToken.user_id == user_id,
+            UserToken.session_id == session_id,
+            UserToken.expires_at > int(time.time()),
+        )
+        try:
+            async with self.engine.connect() as conn:
+                row = (await conn.execute(stmt)).first()
+        except SQLAlchemyError as e:
+            print(f"Error retrieving token: {e}")
+            return None
+        if row is None:
+            return None
+        if row.token_digest is not None:
+            return bytes(row.token_digest)
+        if self.accept_legacy and row.token is not None:
+            return token_digest(row.token)
+        return None
+
+    async def delete(self, user_id: int, session_id: str) -> bool:
+        return await self._delete(user_id, session_id)
+
+    async def delete_all(self, user_id: int) -> bool:
+        return await self._delete(user_id)
+
+    async def _delete(self, user_id: int, session_id: Optional[str] = None) -> bool:
+        stmt = delete(UserToken).where(UserToken.user_id == user_id)
+        if session_id is not None:
+            stmt = stmt.where(UserToken.session_id == session_id)
+        try:
+            async with self.engine.begin() as conn:
+                await conn.execute(stmt)
+            return True
+        except SQLAlchemyError as e:
+            print(f"Error deleting tokens: {e}")
+            return False
@@ -0,0 +1,171 @@
+"""Local SQLite file token store."""
+
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.token_store.base import TokenStore, TokenStoreError, token_digest
+
+
+class SQLiteTokenStore(TokenStore):
+    """Token store kept in a local SQLite file (single host only)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            columns = [
+                row[1] for row in self._conn.execute("PRAGMA table_info(user_tokens)")
+            ]
+            if columns and "refresh_digest" not in columns:
+                # Local file from an older layout: start over, users log in again
+                self._conn.execute("DROP TABLE user_tokens")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS user_tokens ("
+                " user_id INTEGER NOT NULL,"
+                " session_id TEXT NOT NULL,"
+                " token_digest BLOB NOT NULL,"
+                " refresh_digest BLOB,"
+                " expires_at INTEGER NOT NULL,"
+                " PRIMARY KEY (user_id, session_id))"
+            )
+
+    def _store(
+        self,
+        user_id: int,
+        session_id: str,
+        token: str,
+        expire_seconds: int,
+        refresh_token: Optional[str],
+    ) -> None:
+        expires_at = int(time.time()) + expire_seconds
+        refresh_digest = (
+            token_digest(refresh_token) if refresh_token is not None else None
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO user_tokens"
+                " (user_id, session_id, token_digest, refresh_digest, expires_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (user_id, session_id, token_digest(token), refresh_digest, expires_at),
+            )
+
+    def _rotate(
+        self,
+        user_id: int,
+        session_id: str,
+        refresh_token: str,
+        token: str,
+        new_refresh_token: str,
+        expire_seconds: int,
+    ) -> bool:
+        now = int(time.time())
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE user_tokens"
+                " SET token_digest = ?, refresh_digest = ?, expires_at = ?"
+                " WHERE user_id = ? AND session_id = ?"
+                " AND refresh_digest = ? AND expires_at > ?",
+                (
+                    token_digest(token),
+                    token_digest(new_refresh_token),
+                    now + expire_seconds,
+                    user_id,
+                    session_id,
+                    token_digest(refresh_token),
+                    now,
+                ),
+            )
+        return cursor.rowcount == 1
+
+    def _get_digest(self, user_id: int, session_id: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT token_digest FROM user_tokens"
+                " WHERE user_id = ? AND session_id = ? AND expires_at > ?",
+                (user_id, session_id, int(time.time())),
+            ).fetchone()
+        return row[0] if row else None
+
+    def _delete(self, user_id: int, session_id: Optional[str] = None) -> None:
+        with self._lock, self._conn:
+            if session_id is None:
+                self._conn.execute(
+                    "DELETE FROM user_tokens WHERE user_id = ?", (user_id,)
+                )
+            else:
+                self._conn.execute(
+                    "DELETE FROM user_tokens WHERE user_id = ? AND session_id = ?",
+                    (user_id, session_id),
+                )
+
+    async def store(
+        self,
+        user_id: int,
+        session_id: str,
+        token: str,
+        expire_seconds: int,
+        refresh_token: Optional[str] = None,
+    ) -> bool:
+        try:
+            await run_in_threadpool(
+                self._store, user_id, session_id, token, expire_seconds, refresh_token
+            )
+            return True
+        except sqlite3.Error as e:
+            print(f"Error storing token: {e}")
+            return False
+
+    async def rotate(
+        self,
+        user_id: int,
+        session_id: str,
+        refresh_token: str,
+        token: str,
+        new_refresh_token: str,
+        expire_seconds: int,
+    ) -> bool:
+        try:
+            return await run_in_threadpool(
+                self._rotate,
+                user_id,
+                session_id,
+                refresh_token,
+                token,
+                new_refresh_token,
+                expire_seconds,
+            )
+        except sqlite3.Error as e:
+            raise TokenStoreError(f"Error rotating token: {e}") from e
+
+    async def get_digest(self, user_id: int, session_id: str) -> Optional[bytes]:
+        try:
+            return await run_in_threadpool(self._get_digest, user_id, session_id)
+        except sqlite3.Error as e:
+            print(f"Error retrieving token: {e}")
+            return None
+
+    async def delete(self, user_id: int, session_id: str) -> bool:
+        try:
+            await run_in_threadpool(self._delete, user_id, session_id)
+            return True
+        except sqlite3.Error as e:
+            print(f"Error deleting token: {e}")
+            return False
+
+    async def delete_all(self, user_id: int) -> bool:
+        try:
+            await run_in_threadpool(self._delete, user_id)
+            return True
+        except sqlite3.Error as e:
+            print(f"Error deleting tokens: {e}")
+            return False
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,125 @@
+"""Shared fixtures: the application on a throwaway SQLite database.
+
+Settings are read when ``app`` is imported, so the environment is set here,
+before any test module imports it.
+"""
+
+import os
+import tempfile
+
+_database_dir = tempfile.mkdtemp(prefix="supermarket-tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_database_dir}/test.db",
+    DATABASE_READER_URL="",
+    TOKEN_STORE_BACKEND="memory",
+    LOGIN_RATE_LIMIT_BACKEND="memory",
+    JWT_SECRET_KEY="test-secret-key-that-is-long-enough-for-hs256",
+    # Cheap Argon2 parameters; the tests do not measure hashing strength
+    ARGON2_TIME_COST="1",
+    ARGON2_MEMORY_COST="8192",
+    ARGON2_PARALLELISM="1",
+    TOKEN_CACHE_TTL_SECONDS="60",
+)
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.ext.compiler import compiles  # noqa: E402
+from sqlalchemy.schema import CreateColumn, PrimaryKeyConstraint  # noqa: E402
+
+from app.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import ShopAccountEntry  # noqa: E402
+from app.rate_limit import get_login_limiters  # noqa: E402
+from app.token_cache import token_cache  # noqa: E402
+
+PASSWORD = "secret-password"
+
+# The test tables are created with create_all, not the migrations. SQLite
+# cannot autoincrement the (id, year) primary key MySQL partitioning needs,
+# so there id alone is the primary key (the rowid) and year a plain column.
+# The unique period index still includes year.
+_entries = ShopAccountEntry.__table__
+
+
+@compiles(CreateColumn, "sqlite")
+def _compile_sqlite_column(create, compiler, **kw):
+    column = create.element
+    if column is _entries.c.id:
+        return f"{compiler.preparer.format_column(column)} INTEGER NOT NULL PRIMARY KEY"
+    return compiler.visit_create_column(create, **kw)
+
+
+@compiles(PrimaryKeyConstraint, "sqlite")
+def _compile_sqlite_primary_key(constraint, compiler, **kw):
+    if constraint.table is _entries:
+        return None
+    return compiler.visit_primary_key_constraint(constraint, **kw)
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """Create the tables for a test and drop them after it."""
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def client():
+    """Client of the application, with fresh token and login failure caches."""
+    token_cache.clear()
+    get_login_limiters.cache_clear()
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def register(client):
+    """Register a user and get the response body."""
+
+    def register(name: str = "alice", email: str = "") -> dict:
+        response = client.post(
+            "/auth/register",
+            json={
+                "name": name,
+                "email": email or f"{name}@example.com",
+                "password": PASSWORD,
+            },
+        )
+        assert response.status_code == 201, response.text
+        return response.json()
+
+    return register
+
+
+@pytest.fixture
+def login(client):
+    """Log a user in and get the tokens."""
+
+    def login(email: str) -> dict:
+        response = client.post(
+            "/auth/login", json={"email": email, "password": PASSWORD}
+        )
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    return login
+
+
+@pytest.fixture
+def user(register):
+    """A registered user."""
+    return register()
+
+
+@pytest.fixture
+def tokens(login, user):
+    """Tokens of a login of ``user``."""
+    return login(user["email"])
+
+
+@pytest.fixture
+def headers(tokens):
+    """Authorization header of ``tokens``."""
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
@@ -0,0 +1,180 @@
+"""Tests of authentication: login cost, token validation and its cache."""
+
+import statistics
+import time
+
+from app.auth import authenticate_user, pwd_context
+from app.database import AsyncSessionLocal
+from app.token_cache import token_cache
+from app.token_store import TokenStoreError, delete_all_tokens, get_token_store
+
+
+def test_validated_token_is_served_from_the_cache(client, headers, monkeypatch):
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    store = get_token_store()
+
+    async def fail(*args):
+        raise AssertionError("token store called on a cache hit")
+
+    monkeypatch.setattr(store, "get_digest", fail)
+    hits = token_cache.stats()["hits"]
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    assert token_cache.stats()["hits"] == hits + 1
+
+
+def test_logout_evicts_its_token_at_once(client, headers):
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    assert client.post("/auth/logout", headers=headers).status_code == 204
+    assert client.get("/auth/me", headers=headers).status_code == 401
+
+
+def test_revoked_token_stops_working_within_the_cache_ttl(
+    client, user, headers, monkeypatch
+):
+    monkeypatch.setattr(token_cache, "ttl_seconds", 1)
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    # Revoked by another container: the store changes, this cache does not
+    client.portal.call(delete_all_tokens, user["id"])
+    revoked_at = time.monotonic()
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    deadline = revoked_at + token_cache.ttl_seconds + 0.5
+    while client.get("/auth/me", headers=headers).status_code == 200:
+        assert time.monotonic() < deadline, "revoked token still accepted"
+        time.sleep(0.1)
+    assert client.get("/auth/me", headers=headers).status_code == 401
+
+
+def test_refresh_rotation_evicts_the_replaced_access_token(client, tokens, headers):
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    # Tokens issued within the same second are identical; wait for a new one
+    time.sleep(1)
+
+    response = client.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 200
+    assert client.get("/auth/me", headers=headers).status_code == 401
+    new_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    assert client.get("/auth/me", headers=new_headers).status_code == 200
+
+
+def test_refresh_token_reuse_ends_the_session_at_once(client, user, tokens):
+    time.sleep(1)
+    response = client.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    new_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    assert client.get("/auth/me", headers=new_headers).status_code == 200
+
+    response = client.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 401
+    assert client.get("/auth/me", headers=new_headers).status_code == 401
+
+
+def test_rotated_pair_works_and_refreshes_again(client, tokens):
+    time.sleep(1)
+    response = client.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    headers = {"Authorization": f"Bearer {rotated['access_token']}"}
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    response = client.post(
+        "/auth/refresh", json={"refresh_token": rotated["refresh_token"]}
+    )
+    assert response.status_code == 200
+
+
+def test_refresh_token_reuse_revokes_the_rotated_refresh_token(client, tokens):
+    response = client.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    rotated = response.json()
+
+    response = client.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 401
+    # The session is gone, so the pair issued before the reuse is dead too
+    response = client.post(
+        "/auth/refresh", json={"refresh_token": rotated["refresh_token"]}
+    )
+    assert response.status_code == 401
+
+
+def test_access_token_is_not_a_refresh_token(client, tokens):
+    response = client.post(
+        "/auth/refresh", json={"refresh_token": tokens["access_token"]}
+    )
+    assert response.status_code == 401
+
+
+async def _median_authenticate_seconds(email: str, rounds: int) -> float:
+    durations = []
+    async with AsyncSessionLocal() as db:
+        for _ in range(rounds):
+            started_at = time.perf_counter()
+            assert await authenticate_user(db, email, "wrong-password") is None
+            durations.append(time.perf_counter() - started_at)
+    return statistics.median(durations)
+
+
+def test_unknown_email_costs_one_verify(client, user, monkeypatch):
+    calls = []
+
+    def counted(name, method):
+        def call(*args):
+            calls.append(name)
+            return method(*args)
+
+        return call
+
+    for name in ("hash", "verify", "verify_and_update"):
+        monkeypatch.setattr(
+            pwd_context, name, counted(name, getattr(pwd_context, name))
+        )
+
+    client.portal.call(_median_authenticate_seconds, "nobody@example.com", 1)
+    assert calls == ["verify"]
+    calls.clear()
+    client.portal.call(_median_authenticate_seconds, user["email"], 1)
+    assert calls == ["verify_and_update"]
+
+
+def test_unknown_and_known_email_logins_take_as_long(client, user):
+    # Warm up the connection and the hashing threads
+    client.portal.call(_median_authenticate_seconds, user["email"], 2)
+
+    known = client.portal.call(_median_authenticate_seconds, user["email"], 9)
+    unknown = client.portal.call(_median_authenticate_seconds, "nobody@example.com", 9)
+    assert 2 / 3 < unknown / known < 3 / 2, f"known {known:.4f}s unknown {unknown:.4f}s"
+
+
+def test_refresh_keeps_the_session_when_the_store_fails(
+    client, tokens, headers, monkeypatch
+):
+    async def fail(*args):
+        raise TokenStoreError("Error rotating token: unreachable")
+
+    monkeypatch.setattr(get_token_store(), "rotate", fail)
+    response = client.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    monkeypatch.undo()
+    time.sleep(1)
+    response = client.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 200
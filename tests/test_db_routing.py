@@ -0,0 +1,93 @@
+"""Tests of reader routing and read-your-writes, on two SQLite databases."""
+
+import shutil
+import time
+
+import pytest
+from sqlalchemy import create_engine, insert, select, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal, engine, get_async_database_url
+from app.db_routing import LAST_WRITE_COOKIE, LAST_WRITE_HEADER
+from app.models import Shop
+
+SHOP = {"id": 1, "period_type": 1, "is_cumulative": False}
+
+
+def _shop_name(sync_engine) -> str:
+    with sync_engine.connect() as conn:
+        return conn.scalar(select(Shop.name).where(Shop.id == 1))
+
+
+@pytest.fixture
+def reader(client, headers, tmp_path, monkeypatch):
+    """Sync engine of a reader database that GET requests are routed to.
+
+    The reader is a copy of the primary taken while shop 1 was named
+    "reader"; the primary has renamed it since, as if the replica lagged.
+    So responses tell which database served them.
+    """
+    with engine.begin() as conn:
+        conn.execute(insert(Shop).values(name="reader", **SHOP))
+    engine.dispose()
+    shutil.copyfile(engine.url.database, tmp_path / "reader.db")
+    with engine.begin() as conn:
+        conn.execute(update(Shop).where(Shop.id == 1).values(name="primary"))
+
+    url = f"sqlite:///{tmp_path}/reader.db"
+    reader_engine = create_engine(url)
+    async_reader_engine = create_async_engine(get_async_database_url(url))
+    monkeypatch.setitem(AsyncSessionLocal.kw, "reader", async_reader_engine.sync_engine)
+    monkeypatch.setattr(get_settings(), "database_reader_url", url)
+    yield reader_engine
+    client.portal.call(async_reader_engine.dispose)
+    reader_engine.dispose()
+
+
+def test_get_requests_read_from_the_reader(client, headers, reader):
+    response = client.get("/shop/1", headers=headers)
+    assert response.json()["name"] == "reader"
+    assert LAST_WRITE_HEADER not in response.headers
+    assert client.get("/shop", headers=headers).json()[0]["name"] == "reader"
+
+
+def test_writes_go_to_the_primary(client, headers, reader):
+    response = client.put("/shop/1", headers=headers, json={"name": "written"})
+    assert response.status_code == 200
+    assert _shop_name(engine) == "written"
+    assert _shop_name(reader) == "reader"
+
+    last_write_at = float(response.headers[LAST_WRITE_HEADER])
+    assert time.time() - 5 < last_write_at <= time.time()
+    assert client.cookies[LAST_WRITE_COOKIE] == response.headers[LAST_WRITE_HEADER]
+
+
+def test_client_that_just_wrote_reads_from_the_primary(client, headers, reader):
+    response = client.put("/shop/1", headers=headers, json={"name": "written"})
+    last_write = response.headers[LAST_WRITE_HEADER]
+
+    # Browsers send the cookie back
+    assert client.get("/shop/1", headers=headers).json()["name"] == "written"
+
+    # Other clients send the header back
+    client.cookies.clear()
+    assert client.get("/shop/1", headers=headers).json()["name"] == "reader"
+    response = client.get("/shop/1", headers={**headers, LAST_WRITE_HEADER: last_write})
+    assert response.json()["name"] == "written"
+
+
+@pytest.mark.parametrize(
+    "last_write", ["not-a-time", str(time.time() + 3600), str(time.time() - 3600)]
+)
+def test_invalid_or_stale_last_write_reads_from_the_reader(
+    client, headers, reader, last_write
+):
+    response = client.get("/shop/1", headers={**headers, LAST_WRITE_HEADER: last_write})
+    assert response.json()["name"] == "reader"
+
+
+def test_failed_write_sets_no_last_write(client, headers, reader):
+    response = client.put("/shop/99", headers=headers, json={"name": "written"})
+    assert response.status_code == 404
+    assert LAST_WRITE_HEADER not in response.headers
@@ -0,0 +1,79 @@
+"""Tests of the bounded password hashing executor."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app import auth
+from app.hashing import HashingBusyError, PasswordHashExecutor
+
+
+@pytest.fixture
+def release():
+    """Event that frees the worker of ``saturated``."""
+    return threading.Event()
+
+
+@pytest.fixture
+def saturated(release):
+    """A single-worker executor whose worker is busy until ``release``."""
+    executor = PasswordHashExecutor(max_workers=1, max_queue=1, queue_timeout=0.1)
+    started = threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    running = executor.submit(block)
+    assert started.wait(5)
+    yield executor
+    release.set()
+    running.result(5)
+
+
+def test_queued_hash_is_rejected_after_the_queue_timeout(saturated):
+    with pytest.raises(HashingBusyError):
+        asyncio.run(saturated.run_async(lambda: "hash"))
+    stats = saturated.stats()
+    assert (stats["queue_depth"], stats["in_flight"], stats["rejected"]) == (0, 1, 1)
+
+
+def test_hash_beyond_the_queue_is_rejected_at_once(saturated):
+    saturated.submit(lambda: "hash")
+    with pytest.raises(HashingBusyError, match="queue is full"):
+        saturated.submit(lambda: "hash")
+
+
+def test_hash_dequeued_after_the_timeout_is_not_run(saturated, release):
+    calls = []
+    future = saturated.submit(calls.append, "hash")
+    time.sleep(saturated.queue_timeout + 0.05)
+    release.set()
+    with pytest.raises(HashingBusyError):
+        future.result(5)
+    assert calls == []
+
+
+def test_started_hash_is_not_cancelled_by_the_timeout():
+    executor = PasswordHashExecutor(max_workers=1, max_queue=0, queue_timeout=0.05)
+
+    def slow_hash():
+        time.sleep(0.2)
+        return "hash"
+
+    # Running past the timeout is not waiting for a slot: the result is kept
+    assert asyncio.run(executor.run_async(slow_hash)) == "hash"
+    assert executor.stats()["rejected"] == 0
+
+
+def test_login_answers_503_when_hashing_is_saturated(
+    client, user, saturated, monkeypatch
+):
+    monkeypatch.setattr(auth, "hash_executor", saturated)
+    response = client.post(
+        "/auth/login", json={"email": user["email"], "password": "secret-password"}
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,17 @@
+"""Tests of the health endpoints."""
+
+from app.config import get_settings
+
+
+def test_health_needs_no_token(client):
+    assert client.get("/health").json() == {"status": "ok"}
+
+
+def test_metrics_are_for_admins_only(client, user, headers, monkeypatch):
+    assert client.get("/health/metrics").status_code == 401
+    assert client.get("/health/metrics", headers=headers).status_code == 403
+
+    monkeypatch.setattr(get_settings(), "admin_user_ids", [user["id"]])
+    response = client.get("/health/metrics", headers=headers)
+    assert response.status_code == 200
+    assert set(response.json()["token_cache"]) == {"size", "hits", "misses"}
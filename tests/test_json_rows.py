@@ -0,0 +1,117 @@
+"""Tests that the entry list body matches the response schema's JSON."""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import List
+
+import orjson
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.consts import AccountTitleSubType, AccountTitleType
+from app.database import engine
+from app.json_rows import RowEncoder
+from app.models import Shop, ShopAccountEntry, ShopAccountTitle
+from app.repository import ENTRY_ORDER
+from app.schemas import ShopAccountEntryResponse
+
+entry_list_adapter = TypeAdapter(List[ShopAccountEntryResponse])
+
+# (amount, created_at) of the entries of shop 1: amounts with trailing zeros,
+# negative and large, datetimes with and without microseconds
+ENTRIES = [
+    (Decimal("10.50"), datetime(2024, 1, 2, 3, 4, 5)),
+    (Decimal("0.05"), datetime(2024, 1, 2, 3, 4, 5, 123456)),
+    (Decimal("-3.00"), datetime(2024, 12, 31, 23, 59, 59, 1)),
+    (Decimal("9999999999.99"), datetime(2023, 6, 1)),
+]
+
+
+@pytest.fixture
+def entries():
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Shop).values(id=1, name="shop", period_type=1, is_cumulative=False)
+        )
+        conn.execute(
+            insert(ShopAccountTitle).values(
+                id=1,
+                shop_id=1,
+                type=AccountTitleType.REVENUE,
+                sub_type=AccountTitleSubType.SALES,
+                name="sales",
+            )
+        )
+        conn.execute(
+            insert(ShopAccountEntry),
+            [
+                {
+                    "shop_id": 1,
+                    "shop_account_title_id": 1,
+                    "year": 2024,
+                    "month": month,
+                    "amount": amount,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                }
+                for month, (amount, created_at) in enumerate(ENTRIES, start=1)
+            ],
+        )
+
+
+def test_entry_list_body_matches_the_response_schema(client, headers, entries):
+    response = client.get("/shop/1/account_entry", headers=headers)
+    assert response.status_code == 200
+
+    with Session(engine) as db:
+        orm_entries = db.scalars(select(ShopAccountEntry).order_by(*ENTRY_ORDER)).all()
+        expected = entry_list_adapter.dump_json(
+            entry_list_adapter.validate_python(orm_entries)
+        )
+    assert response.content == expected
+
+    body = response.json()
+    assert [entry["amount"] for entry in body] == [
+        "10.50",
+        "0.05",
+        "-3.00",
+        "9999999999.99",
+    ]
+    assert [entry["created_at"] for entry in body] == [
+        "2024-01-02T03:04:05",
+        "2024-01-02T03:04:05.123456",
+        "2024-12-31T23:59:59.000001",
+        "2023-06-01T00:00:00",
+    ]
+
+
+def test_encoded_rows_match_the_response_schema():
+    encoder = RowEncoder(ShopAccountEntryResponse)
+    items = [
+        {
+            "id": month,
+            "shop_id": 1,
+            "shop_account_title_id": 1,
+            "year": 2024,
+            "month": month,
+            "amount": amount,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+        for month, (amount, created_at) in enumerate(ENTRIES, start=1)
+    ]
+    # Rows have the schema's fields in order, as the entry page selects them
+    rows = [[item[name] for name in encoder.fields] for item in items]
+    models = [ShopAccountEntryResponse(**item) for item in items]
+    assert encoder.encode(rows) == entry_list_adapter.dump_json(models)
+    assert encoder.encode([]) == orjson.dumps([]) == entry_list_adapter.dump_json([])
+
+
+def test_unsupported_field_type_is_rejected():
+    class Tags(ShopAccountEntryResponse):
+        tags: List[str]
+
+    with pytest.raises(TypeError, match="tags"):
+        RowEncoder(Tags)
@@ -0,0 +1,140 @@
+"""Tests of keyset (cursor) pagination of the shop and entry lists."""
+
+import pytest
+from sqlalchemy import insert
+
+from app.consts import AccountTitleSubType, AccountTitleType
+from app.database import engine
+from app.models import Shop, ShopAccountEntry, ShopAccountTitle
+from app.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+
+SHOPS = 5
+# (year, month, title) of the entries of shop 1, in no particular order
+PERIODS = [
+    (2024, 2, 1),
+    (2023, 12, 2),
+    (2024, 1, 2),
+    (2024, 1, 1),
+    (2023, 12, 1),
+    (2024, 2, 2),
+    (2025, 1, 1),
+]
+
+
+@pytest.fixture
+def data():
+    """Shops 1..SHOPS, and entries of shop 1 for ``PERIODS``."""
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Shop),
+            [
+                {"name": f"shop {i}", "period_type": 1, "is_cumulative": False}
+                for i in range(1, SHOPS + 1)
+            ],
+        )
+        conn.execute(
+            insert(ShopAccountTitle),
+            [
+                {
+                    "id": title_id,
+                    "shop_id": 1,
+                    "type": AccountTitleType.REVENUE,
+                    "sub_type": AccountTitleSubType.SALES,
+                    "name": f"title {title_id}",
+                }
+                for title_id in (1, 2)
+            ],
+        )
+        conn.execute(
+            insert(ShopAccountEntry),
+            [
+                {
+                    "shop_id": 1,
+                    "shop_account_title_id": title_id,
+                    "year": year,
+                    "month": month,
+                    "amount": 1,
+                }
+                for year, month, title_id in PERIODS
+            ],
+        )
+
+
+def _walk(client, headers, url, limit):
+    """Get every page of ``url`` by following the next page cursor."""
+    pages = []
+    params = {"limit": limit}
+    while True:
+        response = client.get(url, headers=headers, params=params)
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+        params = {"limit": limit, "cursor": cursor}
+
+
+def test_cursor_round_trips():
+    assert decode_cursor(encode_cursor([2024, 1, 2, 15]), 4) == [2024, 1, 2, 15]
+
+
+@pytest.mark.parametrize("limit", [1, 2, SHOPS])
+def test_shop_pages_cover_every_shop_once(client, headers, data, limit):
+    pages = _walk(client, headers, "/shop", limit)
+    assert all(len(page) <= limit for page in pages)
+    ids = [shop["id"] for page in pages for shop in page]
+    assert ids == list(range(1, SHOPS + 1))
+
+
+@pytest.mark.parametrize("limit", [1, 3, len(PERIODS)])
+def test_entry_pages_cover_every_entry_once_in_period_order(
+    client, headers, data, limit
+):
+    pages = _walk(client, headers, "/shop/1/account_entry", limit)
+    entries = [entry for page in pages for entry in page]
+    periods = [
+        (entry["year"], entry["month"], entry["shop_account_title_id"])
+        for entry in entries
+    ]
+    assert periods == sorted(PERIODS)
+    assert len({entry["id"] for entry in entries}) == len(PERIODS)
+
+
+def test_entry_pages_of_years_follow_the_cursor(client, headers, data):
+    params = {"limit": 2, "year_from": 2024, "year_to": 2024}
+    url = "/shop/1/account_entry"
+    first = client.get(url, headers=headers, params=params)
+    cursor = first.headers[NEXT_CURSOR_HEADER]
+    second = client.get(url, headers=headers, params={**params, "cursor": cursor})
+    periods = [
+        (entry["year"], entry["month"], entry["shop_account_title_id"])
+        for entry in first.json() + second.json()
+    ]
+    assert periods == sorted(p for p in PERIODS if p[0] == 2024)
+
+
+@pytest.mark.parametrize(
+    "url, cursor",
+    [
+        ("/shop", "not-a-cursor"),
+        ("/shop", encode_cursor([1, 2])),
+        ("/shop", encode_cursor(["1"])),
+        ("/shop/1/account_entry", encode_cursor([2024, 1, 1])),
+        ("/shop/1/account_entry", encode_cursor([2024, 1, 1, 1.5])),
+        ("/shop/1/account_entry", "e30"),
+    ],
+)
+def test_malformed_cursor_is_rejected(client, headers, data, url, cursor):
+    response = client.get(url, headers=headers, params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.parametrize("url", ["/shop", "/shop/1/account_entry"])
+def test_cursor_and_offset_together_are_rejected(client, headers, data, url):
+    cursor = client.get(url, headers=headers, params={"limit": 1}).headers[
+        NEXT_CURSOR_HEADER
+    ]
+    response = client.get(url, headers=headers, params={"cursor": cursor, "offset": 1})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Use either cursor or offset, not both"
@@ -0,0 +1,103 @@
+"""Tests of the throttling of failed logins."""
+
+import asyncio
+
+import pytest
+
+from app import rate_limit
+from app.rate_limit import MemoryRateLimiter, get_login_limiters
+
+WINDOW_SECONDS = 900
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() of the rate limit module."""
+
+    class Clock:
+        now = 1_000_000.0
+
+    monkeypatch.setattr(rate_limit.time, "time", lambda: Clock.now)
+    return Clock
+
+
+def _limiter(limit: int = 3, max_keys: int = 10) -> MemoryRateLimiter:
+    return MemoryRateLimiter("email", limit, WINDOW_SECONDS, max_keys)
+
+
+def _hits(limiter, key, count):
+    for _ in range(count):
+        asyncio.run(limiter.hit(key))
+
+
+def test_key_is_allowed_below_the_limit(clock):
+    limiter = _limiter()
+    assert asyncio.run(limiter.check("a")) == (0, False)
+    _hits(limiter, "a", 2)
+    assert asyncio.run(limiter.check("a")) == (0, True)
+
+
+def test_key_at_the_limit_waits_for_its_oldest_failure(clock):
+    limiter = _limiter()
+    _hits(limiter, "a", 1)
+    clock.now += 100
+    _hits(limiter, "a", 2)
+    assert asyncio.run(limiter.check("a")) == (WINDOW_SECONDS - 100, True)
+    assert asyncio.run(limiter.check("b")) == (0, False)
+
+    clock.now += WINDOW_SECONDS - 100
+    assert asyncio.run(limiter.check("a")) == (0, True)
+    clock.now += 100
+    assert asyncio.run(limiter.check("a")) == (0, False)
+
+
+def test_reset_forgets_the_failures(clock):
+    limiter = _limiter()
+    _hits(limiter, "a", 3)
+    asyncio.run(limiter.reset("a"))
+    assert asyncio.run(limiter.check("a")) == (0, False)
+
+
+def test_least_recently_failed_key_is_evicted_at_max_keys(clock):
+    limiter = _limiter(max_keys=2)
+    _hits(limiter, "a", 1)
+    _hits(limiter, "b", 1)
+    _hits(limiter, "a", 1)
+    _hits(limiter, "c", 1)
+    assert asyncio.run(limiter.check("b")) == (0, False)
+    assert asyncio.run(limiter.check("a")) == (0, True)
+
+
+def _login(client, email, password):
+    return client.post("/auth/login", json={"email": email, "password": password})
+
+
+def test_login_is_throttled_after_too_many_failures(client, user):
+    email_limiter, _ = get_login_limiters()
+    for _ in range(email_limiter.limit):
+        assert _login(client, user["email"], "wrong-password").status_code == 401
+
+    # Even the right password is refused, before it is verified
+    response = _login(client, user["email"], "secret-password")
+    assert response.status_code == 429
+    assert 0 < int(response.headers["Retry-After"]) <= email_limiter.window_seconds
+    assert _login(client, "other@example.com", "wrong-password").status_code == 401
+
+
+def test_login_resets_failures_only_when_there_were_some(client, user, monkeypatch):
+    email_limiter, _ = get_login_limiters()
+    resets = []
+    reset = email_limiter.reset
+
+    async def counted(key):
+        resets.append(key)
+        await reset(key)
+
+    monkeypatch.setattr(email_limiter, "reset", counted)
+    assert _login(client, user["email"], "secret-password").status_code == 200
+    assert resets == []
+
+    assert _login(client, user["email"], "wrong-password").status_code == 401
+    assert _login(client, user["email"], "secret-password").status_code == 200
+    assert resets == [user["email"]]
+    assert asyncio.run(email_limiter.check(user["email"])) == (0, False)
@@ -0,0 +1,93 @@
+"""Tests of bulk user registration (admin endpoint and CLI)."""
+
+import pytest
+
+from app.commands import provision_users
+from app.config import get_settings
+from conftest import PASSWORD
+
+
+@pytest.fixture
+def admin_headers(user, headers, monkeypatch):
+    """Authorization header of ``user``, made an admin."""
+    monkeypatch.setattr(get_settings(), "admin_user_ids", [user["id"]])
+    return headers
+
+
+def _user(name: str, email: str = "") -> dict:
+    return {"name": name, "email": email or f"{name}@example.com", "password": PASSWORD}
+
+
+def test_bulk_register_is_for_admins_only(client, headers):
+    body = {"users": [_user("bob")]}
+    assert client.post("/auth/register/bulk", json=body).status_code == 401
+    response = client.post("/auth/register/bulk", json=body, headers=headers)
+    assert response.status_code == 403
+
+
+def test_bulk_register_creates_new_users_and_skips_conflicts(
+    client, admin_headers, login
+):
+    users = [
+        _user("bob"),
+        _user("alice", "alice2@example.com"),
+        _user("carol", "ALICE@example.com"),
+        _user("dave"),
+    ]
+    response = client.post(
+        "/auth/register/bulk", json={"users": users}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"] == 2
+    results = body["results"]
+    assert [(r["index"], r["created"], r["detail"]) for r in results] == [
+        (0, True, None),
+        (1, False, "Username already registered"),
+        (2, False, "Email already registered"),
+        (3, True, None),
+    ]
+    assert results[0]["id"] and results[3]["id"]
+    assert results[1]["id"] is None
+    login("bob@example.com")
+    login("dave@example.com")
+
+
+def test_bulk_register_skips_duplicates_within_the_batch(client, admin_headers):
+    users = [
+        _user("bob"),
+        _user("BOB", "bob2@example.com"),
+        _user("eve", "Bob@example.com"),
+    ]
+    response = client.post(
+        "/auth/register/bulk", json={"users": users}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert [(r["created"], r["detail"]) for r in response.json()["results"]] == [
+        (True, None),
+        (False, "Username already registered"),
+        (False, "Email already registered"),
+    ]
+
+
+def test_bulk_register_rejects_too_many_users(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(get_settings(), "bulk_register_max_users", 1)
+    users = [_user("bob"), _user("carol")]
+    response = client.post(
+        "/auth/register/bulk", json={"users": users}, headers=admin_headers
+    )
+    assert response.status_code == 400
+
+
+def test_provision_users_command(client, user, login, tmp_path, capsys):
+    path = tmp_path / "users.csv"
+    path.write_text(
+        "name,email,password\n"
+        f"bob,bob@example.com,{PASSWORD}\n"
+        f"alice,alice3@example.com,{PASSWORD}\n"
+    )
+    assert provision_users.main([str(path), "--workers", "1"]) == 0
+    output = capsys.readouterr().out
+    assert "Username already registered" in output
+    assert "Created 1 of 2 users" in output
+    login("bob@example.com")
@@ -0,0 +1,98 @@
+"""Tests that the entry statements can use the shop/period index and partitions."""
+
+import operator
+
+import pytest
+from sqlalchemy.sql.elements import BinaryExpression, ColumnClause
+
+from app.commands.explain_entries import INDEX_NAME, explain, get_queries
+from app.database import engine
+from app.models import ShopAccountEntry
+from app.repository import (
+    DELETE_ENTRY_OF_SHOP,
+    ENTRY_OF_SHOP,
+    ENTRY_ORDER,
+    ENTRY_ROW_OF_SHOP,
+    entry_page,
+)
+
+AFTER = [2024, 1, 1, 1]
+
+# Pages with and without offset and cursor
+PAGES = {
+    "first": (100, 0, None),
+    "offset": (100, 100, None),
+    "cursor": (100, 0, AFTER),
+}
+
+
+def _filters(stmt):
+    """Get the (column, operator) comparisons ANDed in the WHERE of ``stmt``."""
+    where = stmt.whereclause
+    clauses = getattr(where, "clauses", [where])
+    return {
+        (clause.left.name, clause.operator)
+        for clause in clauses
+        if isinstance(clause, BinaryExpression)
+        and isinstance(clause.left, ColumnClause)
+    }
+
+
+def test_page_order_follows_the_index():
+    (index,) = [
+        index
+        for index in ShopAccountEntry.__table__.indexes
+        if index.name == INDEX_NAME
+    ]
+    columns = [column.name for column in index.columns]
+    assert columns[0] == "shop_id"
+    # The page is of one shop, so the order continues with the index's columns
+    assert [column.name for column in ENTRY_ORDER[:3]] == columns[1:]
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_entry_page_filters_on_the_shop(page):
+    stmt, params = entry_page(1, *PAGES[page])
+    assert ("shop_id", operator.eq) in _filters(stmt)
+    assert params["shop_id"] == 1
+
+
+@pytest.mark.parametrize(
+    "stmt", [ENTRY_OF_SHOP, ENTRY_ROW_OF_SHOP, DELETE_ENTRY_OF_SHOP]
+)
+def test_entry_of_shop_filters_on_the_shop(stmt):
+    assert {("shop_id", operator.eq), ("id", operator.eq)} <= _filters(stmt)
+
+
+@pytest.mark.parametrize("name", get_queries(1, 2024))
+def test_entry_query_plan_uses_the_index(name):
+    stmt, _ = get_queries(1, 2024)[name]
+    with engine.connect() as conn:
+        indexes, _ = explain(conn, stmt)
+    assert INDEX_NAME in indexes
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_entry_page_of_years_filters_on_year(page):
+    stmt, params = entry_page(1, *PAGES[page], 2023, 2024)
+    assert {
+        ("shop_id", operator.eq),
+        ("year", operator.ge),
+        ("year", operator.le),
+    } <= _filters(stmt)
+    assert (params["year_from"], params["year_to"]) == (2023, 2024)
+
+
+def test_entry_page_of_all_years_does_not_filter_on_year():
+    stmt, _ = entry_page(1, *PAGES["first"])
+    assert "year" not in {name for name, _ in _filters(stmt)}
+
+
+@pytest.mark.parametrize(
+    "name", [name for name, (_, years) in get_queries(1, 2024).items() if years]
+)
+def test_entry_query_of_years_filters_on_year(name):
+    stmt, _ = get_queries(1, 2024)[name]
+    # MySQL can only prune the yearly partitions by a year in the WHERE
+    assert ("shop_id", operator.eq) in _filters(stmt)
+    assert "year" in {name for name, _ in _filters(stmt)}
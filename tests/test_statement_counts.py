@@ -0,0 +1,284 @@
+"""Tests of the number of SQL statements each write request issues."""
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.consts import AccountTitleSubType, AccountTitleType
+from app.database import async_engine, engine
+from app.models import ShopAccountTitle
+
+SHOP = {"name": "shop", "period_type": 1, "is_cumulative": False}
+ENTRY = {
+    "shop_id": 1,
+    "shop_account_title_id": 1,
+    "year": 2024,
+    "month": 1,
+    "amount": "10.50",
+}
+
+
+@pytest.fixture
+def statements():
+    """SQL statements the application issues while the test runs."""
+    issued = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        issued.append(statement)
+
+    sync_engine = async_engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield issued
+    event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def shop(client, headers):
+    """A shop with account titles 1 and 2, and title 3 of another shop."""
+    for _ in range(2):
+        assert client.post("/shop", headers=headers, json=SHOP).status_code == 201
+    with engine.begin() as conn:
+        conn.execute(
+            insert(ShopAccountTitle),
+            [
+                {
+                    "id": title_id,
+                    "shop_id": shop_id,
+                    "type": AccountTitleType.REVENUE,
+                    "sub_type": AccountTitleSubType.SALES,
+                    "name": f"title {title_id}",
+                    "order": title_id,
+                }
+                for title_id, shop_id in ((1, 1), (2, 1), (3, 2))
+            ],
+        )
+    # Validated once, the token costs no statements in the requests below
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    return 1
+
+
+@pytest.fixture
+def entry(client, headers, shop):
+    """An entry of ``shop``."""
+    response = client.post(f"/shop/{shop}/account_entry", headers=headers, json=ENTRY)
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.fixture
+def mysql_like(monkeypatch):
+    """Make the async engine's dialect lack UPDATE ... RETURNING, like MySQL."""
+    monkeypatch.setattr(async_engine.sync_engine.dialect, "update_returning", False)
+
+
+def _request(client, statements, method, url, **kwargs):
+    statements.clear()
+    response = client.request(method, url, **kwargs)
+    return response, len(statements)
+
+
+def test_shop_writes_take_one_statement(client, headers, shop, statements):
+    response, count = _request(
+        client, statements, "POST", "/shop", headers=headers, json=SHOP
+    )
+    assert (response.status_code, count) == (201, 1)
+    shop_id = response.json()["id"]
+    assert response.json()["name"] == "shop"
+
+    response, count = _request(
+        client,
+        statements,
+        "PUT",
+        f"/shop/{shop_id}",
+        headers=headers,
+        json={"name": "renamed"},
+    )
+    assert (response.status_code, count) == (200, 1)
+    assert response.json()["name"] == "renamed"
+
+    # A shop with account titles is not deleted; the new one has none
+    response, count = _request(
+        client, statements, "DELETE", f"/shop/{shop_id}", headers=headers
+    )
+    assert (response.status_code, count) == (204, 1)
+
+
+def test_shop_update_takes_two_statements_without_returning(
+    client, headers, shop, statements, mysql_like
+):
+    response, count = _request(
+        client,
+        statements,
+        "PUT",
+        f"/shop/{shop}",
+        headers=headers,
+        json={"name": "renamed"},
+    )
+    assert (response.status_code, count) == (200, 2)
+    assert response.json()["name"] == "renamed"
+
+
+def test_shop_write_failures(client, headers, shop, statements):
+    response, count = _request(
+        client, statements, "PUT", "/shop/99", headers=headers, json={"name": "renamed"}
+    )
+    assert (response.status_code, count) == (404, 1)
+
+    response, count = _request(
+        client, statements, "DELETE", "/shop/99", headers=headers
+    )
+    assert (response.status_code, count) == (404, 2)
+
+    response, count = _request(
+        client, statements, "DELETE", f"/shop/{shop}", headers=headers
+    )
+    assert (response.status_code, count) == (409, 2)
+
+
+def test_entry_writes_take_one_statement(client, headers, shop, statements):
+    url = f"/shop/{shop}/account_entry"
+    response, count = _request(
+        client, statements, "POST", url, headers=headers, json=ENTRY
+    )
+    assert (response.status_code, count) == (201, 1)
+    entry_id = response.json()["id"]
+
+    response, count = _request(
+        client,
+        statements,
+        "PUT",
+        f"{url}/{entry_id}",
+        headers=headers,
+        json={"id": entry_id, "shop_account_title_id": 2, "amount": "3"},
+    )
+    assert (response.status_code, count) == (200, 1)
+    assert response.json()["shop_account_title_id"] == 2
+    assert response.json()["amount"] == "3.00"
+
+    response, count = _request(
+        client, statements, "DELETE", f"{url}/{entry_id}", headers=headers
+    )
+    assert (response.status_code, count) == (204, 1)
+
+
+def test_entry_update_takes_two_statements_without_returning(
+    client, headers, shop, entry, statements, mysql_like
+):
+    response, count = _request(
+        client,
+        statements,
+        "PUT",
+        f"/shop/{shop}/account_entry/{entry['id']}",
+        headers=headers,
+        json={"id": entry["id"], "amount": "3"},
+    )
+    assert (response.status_code, count) == (200, 2)
+    assert response.json()["amount"] == "3.00"
+
+
+def test_duplicate_entry_takes_one_statement(client, headers, shop, entry, statements):
+    url = f"/shop/{shop}/account_entry"
+    detail = "ShopAccountEntry already registered for this period and title"
+    response, count = _request(
+        client, statements, "POST", url, headers=headers, json=ENTRY
+    )
+    assert (response.status_code, count) == (400, 1)
+    assert response.json()["detail"] == detail
+
+    other = client.post(url, headers=headers, json={**ENTRY, "month": 2}).json()
+    response, count = _request(
+        client,
+        statements,
+        "PUT",
+        f"{url}/{other['id']}",
+        headers=headers,
+        json={"id": other["id"], "month": 1},
+    )
+    assert (response.status_code, count) == (400, 1)
+    assert response.json()["detail"] == detail
+
+
+@pytest.mark.parametrize(
+    "shop_id, entry_id, title_id, status_code, detail",
+    [
+        (99, 1, None, 404, "Shop not found"),
+        (1, 99, None, 404, "ShopAccountEntry not found"),
+        (1, 1, 3, 400, "ShopAccountTitle not found"),
+    ],
+)
+def test_entry_update_failure_takes_two_statements(
+    client, headers, entry, statements, shop_id, entry_id, title_id, status_code, detail
+):
+    body = {"id": entry_id, "amount": "3"}
+    if title_id is not None:
+        body["shop_account_title_id"] = title_id
+    response, count = _request(
+        client,
+        statements,
+        "PUT",
+        f"/shop/{shop_id}/account_entry/{entry_id}",
+        headers=headers,
+        json=body,
+    )
+    assert (response.status_code, count) == (status_code, 2)
+    assert response.json()["detail"] == detail
+
+
+@pytest.mark.parametrize(
+    "shop_id, title_id, status_code, detail",
+    [(99, 1, 404, "Shop not found"), (1, 3, 400, "ShopAccountTitle not found")],
+)
+def test_entry_create_failure_takes_two_statements(
+    client, headers, shop, statements, shop_id, title_id, status_code, detail
+):
+    response, count = _request(
+        client,
+        statements,
+        "POST",
+        f"/shop/{shop_id}/account_entry",
+        headers=headers,
+        json={**ENTRY, "shop_account_title_id": title_id},
+    )
+    assert (response.status_code, count) == (status_code, 2)
+    assert response.json()["detail"] == detail
+
+
+@pytest.mark.parametrize(
+    "shop_id, entry_id, detail",
+    [(99, 1, "Shop not found"), (1, 99, "ShopAccountEntry not found")],
+)
+def test_entry_delete_failure_takes_two_statements(
+    client, headers, entry, statements, shop_id, entry_id, detail
+):
+    response, count = _request(
+        client,
+        statements,
+        "DELETE",
+        f"/shop/{shop_id}/account_entry/{entry_id}",
+        headers=headers,
+    )
+    assert (response.status_code, count) == (404, 2)
+    assert response.json()["detail"] == detail
+
+
+def test_register_takes_one_insert(client, statements):
+    user = {"name": "alice", "email": "alice@example.com", "password": "secret"}
+    response, count = _request(client, statements, "POST", "/auth/register", json=user)
+    assert (response.status_code, count) == (201, 1)
+    assert statements[0].startswith("INSERT INTO users")
+
+
+@pytest.mark.parametrize(
+    "name, email, detail",
+    [
+        ("alice", "other@example.com", "Username already registered"),
+        ("other", "alice@example.com", "Email already registered"),
+    ],
+)
+def test_duplicate_register_takes_one_insert(
+    client, register, statements, name, email, detail
+):
+    register()
+    user = {"name": name, "email": email, "password": "secret"}
+    response, count = _request(client, statements, "POST", "/auth/register", json=user)
+    assert (response.status_code, count) == (400, 1)
+    assert response.json()["detail"] == detail
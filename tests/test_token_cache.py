@@ -0,0 +1,92 @@
+"""Tests of the in-process access token cache."""
+
+import pytest
+
+from app import token_cache as token_cache_module
+from app.token_cache import TokenCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() of the cache module."""
+
+    class Clock:
+        now = 1_000_000.0
+
+    monkeypatch.setattr(token_cache_module.time, "time", lambda: Clock.now)
+    return Clock
+
+
+def test_get_counts_hits_and_misses():
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    assert cache.get("token") is None
+    cache.set("token", 1, "identity")
+    assert cache.get("token") == "identity"
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1}
+
+
+def test_entry_expires_after_the_ttl(clock):
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    cache.set("token", 1, "identity")
+    clock.now += 59
+    assert cache.get("token") == "identity"
+    clock.now += 1
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_entry_expires_with_the_token_when_sooner(clock):
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    cache.set("token", 1, "identity", token_exp=int(clock.now) + 10)
+    clock.now += 10
+    assert cache.get("token") is None
+
+
+def test_least_recently_used_entry_is_evicted_at_max_size():
+    cache = TokenCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1, "a")
+    cache.set("b", 2, "b")
+    assert cache.get("a") == "a"
+    cache.set("c", 3, "c")
+    assert cache.get("b") is None
+    assert cache.get("a") == "a"
+    assert cache.get("c") == "c"
+    assert cache.stats()["size"] == 2
+
+
+@pytest.mark.parametrize("max_size, ttl_seconds", [(0, 60), (10, 0)])
+def test_disabled_cache_keeps_nothing(max_size, ttl_seconds):
+    cache = TokenCache(max_size=max_size, ttl_seconds=ttl_seconds)
+    cache.set("token", 1, "identity")
+    assert cache.get("token") is None
+
+
+def test_invalidate_evicts_one_token():
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    cache.set("a", 1, "a")
+    cache.set("b", 1, "b")
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") == "b"
+
+
+def test_invalidate_user_evicts_all_their_tokens():
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    cache.set("a", 1, "a", session_id="phone")
+    cache.set("b", 1, "b", session_id="laptop")
+    cache.set("c", 2, "c", session_id="phone")
+    cache.invalidate_user(1)
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") == "c"
+
+
+def test_invalidate_session_evicts_only_that_session():
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    cache.set("a", 1, "a", session_id="phone")
+    cache.set("b", 1, "b", session_id="laptop")
+    cache.set("c", 2, "c", session_id="phone")
+    cache.invalidate_session(1, "phone")
+    assert cache.get("a") is None
+    assert cache.get("b") == "b"
+    assert cache.get("c") == "c"
@@ -0,0 +1,136 @@
+"""Tests of the token store backends that run without a server."""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.commands.benchmark_token_store import measure_renewal_cpu, run_workload
+from app.token_store.base import TokenStoreError
+from app.token_store.memory import MemoryTokenStore
+from app.token_store.sqlite import SQLiteTokenStore
+
+EXPIRE_SECONDS = 60
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """A token store of each local backend."""
+    if request.param == "memory":
+        store = MemoryTokenStore(max_size=100)
+    else:
+        store = SQLiteTokenStore(str(tmp_path / "tokens.db"))
+    yield store
+    asyncio.run(store.close())
+
+
+def test_stored_token_is_valid(store):
+    async def check():
+        assert await store.store(1, "phone", "access", EXPIRE_SECONDS, "refresh")
+        assert await store.is_valid(1, "phone", "access")
+        assert not await store.is_valid(1, "phone", "other")
+        assert not await store.is_valid(1, "laptop", "access")
+        assert not await store.is_valid(2, "phone", "access")
+
+    asyncio.run(check())
+
+
+def test_expired_token_is_not_valid(store):
+    async def check():
+        assert await store.store(1, "phone", "access", -1)
+        assert await store.get_digest(1, "phone") is None
+
+    asyncio.run(check())
+
+
+def test_refresh_token_rotates_once(store):
+    async def check():
+        await store.store(1, "phone", "access", EXPIRE_SECONDS, "refresh")
+        assert await store.rotate(
+            1, "phone", "refresh", "access2", "refresh2", EXPIRE_SECONDS
+        )
+        assert await store.is_valid(1, "phone", "access2")
+        assert not await store.is_valid(1, "phone", "access")
+        # The replaced refresh token is used up
+        assert not await store.rotate(
+            1, "phone", "refresh", "access3", "refresh3", EXPIRE_SECONDS
+        )
+        assert await store.is_valid(1, "phone", "access2")
+        assert await store.rotate(
+            1, "phone", "refresh2", "access3", "refresh3", EXPIRE_SECONDS
+        )
+
+    asyncio.run(check())
+
+
+def test_delete_ends_one_session(store):
+    async def check():
+        await store.store(1, "phone", "access", EXPIRE_SECONDS)
+        await store.store(1, "laptop", "access", EXPIRE_SECONDS)
+        assert await store.delete(1, "phone")
+        assert not await store.is_valid(1, "phone", "access")
+        assert await store.is_valid(1, "laptop", "access")
+
+    asyncio.run(check())
+
+
+def test_delete_all_ends_every_session_of_the_user(store):
+    async def check():
+        await store.store(1, "phone", "access", EXPIRE_SECONDS)
+        await store.store(1, "laptop", "access", EXPIRE_SECONDS)
+        await store.store(2, "phone", "access", EXPIRE_SECONDS)
+        assert await store.delete_all(1)
+        assert not await store.is_valid(1, "phone", "access")
+        assert not await store.is_valid(1, "laptop", "access")
+        assert await store.is_valid(2, "phone", "access")
+
+    asyncio.run(check())
+
+
+def test_sqlite_store_keeps_tokens_across_instances(tmp_path):
+    path = str(tmp_path / "tokens.db")
+
+    async def check():
+        first = SQLiteTokenStore(path)
+        await first.store(1, "phone", "access", EXPIRE_SECONDS)
+        await first.close()
+        second = SQLiteTokenStore(path)
+        assert await second.is_valid(1, "phone", "access")
+        await second.close()
+
+    asyncio.run(check())
+
+
+def test_sqlite_store_starts_over_on_an_old_layout(tmp_path):
+    path = str(tmp_path / "tokens.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE user_tokens (user_id INTEGER PRIMARY KEY, token TEXT)"
+        )
+    conn.close()
+
+    async def check():
+        store = SQLiteTokenStore(path)
+        assert await store.store(1, "phone", "access", EXPIRE_SECONDS, "refresh")
+        assert await store.is_valid(1, "phone", "access")
+        await store.close()
+
+    asyncio.run(check())
+
+
+def test_sqlite_store_raises_when_rotation_fails(tmp_path):
+    store = SQLiteTokenStore(str(tmp_path / "tokens.db"))
+    asyncio.run(store.close())
+    with pytest.raises(TokenStoreError):
+        asyncio.run(
+            store.rotate(1, "phone", "refresh", "access", "refresh2", EXPIRE_SECONDS)
+        )
+
+
+def test_benchmark_refreshes_and_compares_renewal_cpu():
+    results = asyncio.run(
+        run_workload("memory", sessions=3, validations=2, concurrency=2, refreshes=2)
+    )
+    assert results["refresh"]["count"] == 6
+    cpu_ms = asyncio.run(measure_renewal_cpu("memory", renewals=2))
+    assert set(cpu_ms) == {"refresh", "relogin"}